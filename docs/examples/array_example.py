@@ -167,10 +167,8 @@ fhandle = open(clayered)
 shape = (3, 1000, 100)
 clmfa = MFArray.load(fhandle, data_path, shape, header=False, layered=True)
 
-clmfa._value
+clmfa._value  # contiguous (nlay, nrow, ncol) storage
 
-for obj in clmfa._value:
-    print(obj._value)
 clmfa.how
 
 vals = clmfa.value
@@ -197,8 +195,7 @@ clmfa.how
 
 # verify that the constants haven't
 # been converted to array internally
-for obj in clmfa._value[1:]:
-    print(obj._value)
+clmfa.how[1:]
 
 vals = clmfa.value
 
@@ -1,14 +1,17 @@
 import math
+import operator
 import re
+from collections import namedtuple
 from enum import Enum
-from io import StringIO
+from itertools import repeat
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
-from flopy.utils.flopy_io import line_strip, multi_line_strip
 
 from flopy4.constants import CommonNames
+from flopy4.io.tokens import TokenReader, next_line
+from flopy4.mf6.binary import BinaryArray
 from flopy4.param import MFParam, MFReader
 
 
@@ -24,137 +27,189 @@ class NumPyArrayMixin:
 
     """
 
-    def __iadd__(self, other):
+    def _apply(self, op, other):
+        """Apply an in-place operator to the array."""
+        self._load_external()
+        self._value = op(self._value, other)
         if self.layered:
-            for mfa in self._value:
-                mfa += other
-            return self
-
-        self._value += other
+            self._check_constant_layers()
+        self._invalidate()
         return self
 
-    def __imul__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa *= other
-            return self
+    def __iadd__(self, other):
+        return self._apply(operator.iadd, other)
 
-        self._value *= other
-        return self
+    def __imul__(self, other):
+        return self._apply(operator.imul, other)
 
     def __isub__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa -= other
-            return self
-
-        self._value -= other
-        return self
+        return self._apply(operator.isub, other)
 
     def __itruediv__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa /= other
-            return self
-
-        self._value /= other
-        return self
+        return self._apply(operator.itruediv, other)
 
     def __ifloordiv__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa /= other
-            return self
-
-        self._value /= other
-        return self
+        return self._apply(operator.ifloordiv, other)
 
     def __ipow__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa /= other
-            return self
-
-        self._value **= other
-        return self
+        return self._apply(operator.ipow, other)
 
     def __add__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa += other
-            return self
-
-        self._value += other
-        return self
+        return self._apply(operator.iadd, other)
 
     def __mul__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa *= other
-            return self
-
-        self._value *= other
-        return self
+        return self._apply(operator.imul, other)
 
     def __sub__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa -= other
-            return self
-
-        self._value -= other
-        return self
+        return self._apply(operator.isub, other)
 
     def __truediv__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa /= other
-            return self
-
-        self._value /= other
-        return self
+        return self._apply(operator.itruediv, other)
 
     def __floordiv__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa /= other
-            return self
-
-        self._value /= other
-        return self
+        return self._apply(operator.ifloordiv, other)
 
     def __pow__(self, other):
-        if self.layered:
-            for mfa in self._value:
-                mfa /= other
-            return self
-
-        self._value **= other
-        return self
+        return self._apply(operator.ipow, other)
 
     def __iter__(self):
+        constant = self._constant(factored=False)
+        if constant is not None:
+            yield from constant
+            return
+
         for i in self.raw.ravel():
             yield i
 
     def min(self):
+        constant = self._constant()
+        if constant is not None:
+            return constant.min()
         return np.nanmin(self.value)
 
     def mean(self):
+        constant = self._constant()
+        if constant is not None:
+            return constant.mean()
         return np.nanmean(self.value)
 
     def median(self):
+        constant = self._constant()
+        if constant is not None:
+            return constant.median()
         return np.nanmedian(self.value)
 
     def max(self):
+        constant = self._constant()
+        if constant is not None:
+            return constant.max()
         return np.nanmax(self.value)
 
     def std(self):
+        constant = self._constant()
+        if constant is not None:
+            return constant.std()
         return np.nanstd(self.value)
 
     def sum(self):
+        constant = self._constant()
+        if constant is not None:
+            return constant.sum()
         return np.nansum(self.value)
 
 
+class ConstantArray:
+    """
+    A read-only, array-like view of a constant value which
+    never materializes a full grid. Reductions are computed
+    analytically. The shape may be deferred until known.
+    """
+
+    def __init__(self, value, shape=None):
+        self.value = value
+        self.shape = shape
+
+    def __repr__(self):
+        return f"ConstantArray(value={self.value!r}, shape={self.shape!r})"
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.full(self.shape, self.value, dtype=dtype)
+        return self.view(dtype)
+
+    def __getitem__(self, item):
+        return self.view()[item]
+
+    def __iter__(self):
+        return repeat(self.value, self.size)
+
+    @property
+    def size(self) -> int:
+        return math.prod(np.atleast_1d(self._known_shape()).tolist())
+
+    def view(self, dtype=None) -> np.ndarray:
+        """
+        Return a zero-copy, read-only view via `np.broadcast_to`.
+        """
+        return np.broadcast_to(
+            np.asarray(self.value, dtype=dtype), self._known_shape()
+        )
+
+    def _known_shape(self):
+        if self.shape is None:
+            raise ValueError("Constant array shape is not yet known")
+        return self.shape
+
+    def min(self):
+        return self.value
+
+    def mean(self):
+        return self.value
+
+    def median(self):
+        return self.value
+
+    def max(self):
+        return self.value
+
+    def std(self):
+        return 0.0
+
+    def sum(self):
+        return self.value * self.size
+
+
+class Selection(np.ndarray):
+    """
+    A read-only view of part of an `MFArray`. Writing to it
+    raises, but in-place operators return a new array, so an
+    augmented assignment like `array[0] += 1` is written back
+    through `MFArray.__setitem__`.
+    """
+
+    def __iadd__(self, other):
+        return np.add(np.asarray(self), other)
+
+    def __imul__(self, other):
+        return np.multiply(np.asarray(self), other)
+
+    def __isub__(self, other):
+        return np.subtract(np.asarray(self), other)
+
+    def __itruediv__(self, other):
+        return np.true_divide(np.asarray(self), other)
+
+    def __ifloordiv__(self, other):
+        return np.floor_divide(np.asarray(self), other)
+
+    def __ipow__(self, other):
+        return np.power(np.asarray(self), other)
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses"])
+"""`MFArray` value cache statistics."""
+
+
 class MFArrayType(Enum):
     """
     How a MODFLOW 6 input array is represented in an input file.
@@ -181,6 +236,11 @@ class MFArray(MFParam, NumPyArrayMixin):
     A MODFLOW 6 array backed by a 1-dimensional NumPy array,
     which is reshaped as needed for various views. Supports
     array indexing as well as standard NumPy array ufuncs.
+
+    A layered array is backed by one contiguous array with
+    shape `(nlay, ...)`, where each layer is a zero-copy view.
+    Per-layer `how`, `factor`, `path` and `binary` metadata
+    are kept as lists alongside.
     """
 
     def __init__(
@@ -205,6 +265,8 @@ class MFArray(MFParam, NumPyArrayMixin):
         reader=MFReader.urword,
         default_value=None,
         path: Optional[Path] = None,
+        cwd: Optional[Path] = None,
+        binary: bool = False,
     ):
         MFParam.__init__(
             self,
@@ -225,21 +287,49 @@ class MFArray(MFParam, NumPyArrayMixin):
             shape=shape,
             default_value=default_value,
         )
+        if layered and isinstance(shape, (tuple, list)):
+            # layer metadata may be given once for all layers
+            nlay = shape[0]
+            if not isinstance(how, list):
+                how = [how] * nlay
+            if not isinstance(factor, list):
+                factor = [factor] * nlay
+            if not isinstance(path, list):
+                path = [path] * nlay
+            if not isinstance(binary, list):
+                binary = [binary] * nlay
         self._value = array
         self._shape = shape
         self._how = how
         self._factor = factor
         self._path = path
+        self._cwd = cwd
+        self._binary = binary
+        self._pending = []
+        self._cache = None
+        self._hits = 0
+        self._misses = 0
+        self._binaries = set()
 
     def __getitem__(self, item):
-        return self.raw[item]
+        # selections are read-only, so edits can only reach the
+        # array via `__setitem__`, e.g. by `array[i] += x`
+        selection = self.raw[item]
+        if not isinstance(selection, np.ndarray):
+            return selection
+        selection = selection.view(Selection)
+        selection.flags.writeable = False
+        return selection
 
     def __setitem__(self, key, value):
-        values = self.raw
+        values = self._raw()
+        if not self.layered and self._how == MFArrayType.constant:
+            # only materialize constants when writing elements
+            values = np.array(values)
         values[key] = value
         if self.layered:
-            for ix, mfa in enumerate(self._value):
-                mfa[:] = values[ix]
+            self._check_constant_layers()
+            self._invalidate()
             return
 
         values = values.ravel()
@@ -251,6 +341,19 @@ class MFArray(MFParam, NumPyArrayMixin):
                 self._value = values[0]
         else:
             self._value = values
+        self._invalidate()
+
+    def _check_constant_layers(self):
+        """
+        Make constant layers internal if they're no longer uniform,
+        since constant layers must stay uniform to stay constant.
+        """
+        for i, how in enumerate(self._how):
+            layer = self._value[i]
+            if how == MFArrayType.constant and not np.allclose(
+                layer, layer.flat[0]
+            ):
+                self._how[i] = MFArrayType.internal
 
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
         raw = self.raw
@@ -258,7 +361,7 @@ class MFArray(MFParam, NumPyArrayMixin):
             result = raw.__array_ufunc__(ufunc, method, raw, **kwargs)
         else:
             result = raw.__array_ufunc__(
-                ufunc, method, raw, *inputs[1:], kwargs
+                ufunc, method, raw, *inputs[1:], **kwargs
             )
         if not isinstance(result, np.ndarray):
             raise NotImplementedError(f"{str(ufunc)} has not been implemented")
@@ -276,21 +379,31 @@ class MFArray(MFParam, NumPyArrayMixin):
     @property
     def value(self) -> Optional[np.ndarray]:
         """
-        Return the array.
+        Return the array. The result is cached (and read-only)
+        until the array is next modified.
         """
+        if self._cache is not None:
+            self._hits += 1
+            return self._cache
+
+        self._load_external()
         if self._value is None:
             return None
 
+        self._misses += 1
         if self.layered:
-            arr = []
-            for mfa in self._value:
-                arr.append(mfa.value)
-            return np.array(arr)
-
-        if self._how == MFArrayType.constant:
-            return np.ones(self._shape) * self._value * self.factor
+            factor = np.array(self.factor).reshape(
+                (-1,) + (1,) * (self._value.ndim - 1)
+            )
+            value = self._value * factor
+        elif self._how == MFArrayType.constant:
+            value = self._constant().view()
         else:
-            return self._value.reshape(self._shape) * self.factor
+            value = self._value.reshape(self._shape) * self.factor
+
+        value.flags.writeable = False
+        self._cache = value
+        return value
 
     @value.setter
     def value(self, value: Optional[np.ndarray]):
@@ -302,32 +415,141 @@ class MFArray(MFParam, NumPyArrayMixin):
                 f"Expected array with shape {self.shape},"
                 f"got shape {value.shape}"
             )
+        # deferred layers (or a memory map) are replaced too,
+        # so they mustn't be read over the new value later
         self._value = value
+        self._pending = []
+        if self.layered:
+            self._check_constant_layers()
+        elif self._how == MFArrayType.constant:
+            self._how = MFArrayType.internal
+        self._invalidate()
+
+    def _invalidate(self):
+        """
+        Discard the cached value and mark the array dirty.
+        Must be called whenever the array's data is modified.
+        """
+        self._cache = None
+        self._binaries = set()
+        self.dirty = True
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Return value cache statistics, like `functools.lru_cache`.
+        """
+        return CacheInfo(self._hits, self._misses)
 
     @property
     def raw(self):
         """
         Return the array without multiplying by `self.factor`.
+        The result is a read-only view, so that modifications
+        go through item assignment or in-place operators, and
+        invalidate the value cache.
         """
+        raw = self._raw()
+        if raw.flags.writeable:
+            raw = raw.view()
+            raw.flags.writeable = False
+        return raw
+
+    def _raw(self):
+        """Return the unfactored array, writable unless constant."""
+        self._load_external()
         if self.layered:
-            arr = []
-            for mfa in self._value:
-                arr.append(mfa.raw)
-            return np.array(arr)
+            return self._value
 
         if self._how == MFArrayType.constant:
-            return np.ones(self._shape) * self._value
+            return self._constant(factored=False).view()
         else:
             return self._value.reshape(self._shape)
 
+    def _constant(self, factored=True) -> Optional[ConstantArray]:
+        """
+        Return a constant view of the array if it is constant.
+        """
+        if self.layered or self._how != MFArrayType.constant:
+            return None
+
+        value = self._value * self.factor if factored else self._value
+        return ConstantArray(value, self._shape)
+
+    @property
+    def deferred(self) -> bool:
+        """
+        Whether the array is external and not yet read from file.
+        """
+        if self.layered:
+            return len(self._pending) > 0
+
+        return (
+            self._value is None
+            and self._how == MFArrayType.external
+            and self._path is not None
+        )
+
+    def _load_external(self):
+        """
+        Read deferred external array data from file.
+        """
+        if not self.deferred:
+            return
+
+        if self.layered:
+            lshp = self._value.shape[1:]
+            for i in self._pending:
+                self._value[i] = MFArray.read_external(
+                    Path(self._cwd or "") / self._path[i],
+                    lshp,
+                    self._binary[i],
+                    self._dtype,
+                ).reshape(lshp)
+            self._pending = []
+        else:
+            self._value = MFArray.read_external(
+                Path(self._cwd or "") / self._path,
+                self._shape,
+                self._binary,
+                self._dtype,
+            )
+            if self._shape is None:
+                # shape deferred until the file is read
+                self._shape = self._value.shape
+                self.shape = self._shape
+
+    @staticmethod
+    def read_external(fpath, shape, binary=False, dtype=np.float64):
+        """
+        Read an external array file into a flat NumPy array
+        representation. Binary files are memory-mapped (copy-
+        on-write) rather than read, so slicing pulls in only
+        the pages it touches. If `shape` is None, it's taken
+        from the binary header or the number of text values.
+        `dtype` is the array's data type.
+        """
+        if binary:
+            size = None
+            if shape is not None:
+                size = math.prod(np.atleast_1d(shape).tolist())
+            return BinaryArray(shape=size, dtype=dtype).read(
+                fpath, memmap=True
+            )
+        with open(fpath) as f:
+            return MFArray.read_array(f, shape, dtype)
+
+    @property
+    def _dtype(self):
+        """The array's data type, as read from file."""
+        return _array_dtype(self.type)
+
     @property
     def factor(self) -> Optional[float]:
         """
         Optional factor by which to multiply array elements.
         """
         if self.layered:
-            factor = [mfa.factor for mfa in self._value]
-            return factor
+            return [1.0 if f is None else f for f in self._factor]
 
         factor = self._factor
         if self._factor is None:
@@ -340,90 +562,192 @@ class MFArray(MFParam, NumPyArrayMixin):
         How the array is to be written to the input file.
         """
         if self.layered:
-            how = [mfa.how for mfa in self._value]
-            return how
+            return list(self._how)
 
         return self._how
 
+    @staticmethod
+    def _external_options(factor, binary) -> str:
+        """
+        Return the external array control line options.
+        """
+        options = ""
+        if factor:
+            options += f" FACTOR {factor}"
+        if binary:
+            options += " (BINARY)"
+        return options
+
     def write(self, f, **kwargs):
+        """
+        Write the array to file. Internal array values are
+        streamed with `write_array`, which accepts `columns`,
+        `width` and `digits` keyword arguments to control the
+        print format, like MF6 `IPRN`.
+
+        If `binary_threshold` is given, internal arrays (or, if
+        layered, layers) with more values than the threshold are
+        written to external binary files under `basepath` instead,
+        named by `prefix` (e.g. the package name), the array name
+        and the layer number, if any.
+        """
         PAD = "  "
+        fmt = {
+            k: kwargs[k] for k in ("columns", "width", "digits") if k in kwargs
+        }
+        threshold = kwargs.get("binary_threshold")
         if self.layered:
             f.write(f"{PAD}" + f"{self.name.upper()} LAYERED\n")
-            for mfa in self._value:
-                values = mfa.raw
-                if mfa._how == MFArrayType.internal:
-                    if len(values.shape) == 1:
-                        v = f"{PAD*3}"
-                        v += " ".join([str(x) for x in values])
-                        v += "\n"
-                    elif len(values.shape) == 2:
-                        v = f"\n{PAD*3}"
-                        v = v.join(" ".join(str(x) for x in y) for y in values)
-                    elif len(values.shape) == 3:
-                        v = f"{PAD*3}"
-                        for i in range(len(values)):
-                            v += " ".join(
-                                f"\n{PAD*3}" + " ".join(str(x) for x in y)
-                                for y in values[i]
-                            )
-                    lines = f"{PAD*2}" + f"{MFArrayType.to_string(mfa._how)}"
-                    if mfa._factor:
-                        lines += f" FACTOR {mfa._factor}"
-                    lines += f"\n{PAD*3}" + f"{v}\n"
-                elif mfa._how == MFArrayType.external:
-                    lines = (
-                        f"{PAD*2}" + f"{MFArrayType.to_string(mfa._how)} "
-                        f"{mfa._path}\n"
+            layers = zip(
+                self._value, self._how, self._factor, self._path, self._binary
+            )
+            for i, (values, how, factor, path, binary) in enumerate(layers):
+                if (
+                    how == MFArrayType.internal
+                    and threshold is not None
+                    and values.size > threshold
+                ):
+                    extpath = self._write_binary(values, ilay=i + 1, **kwargs)
+                    f.write(
+                        f"{PAD*2}"
+                        + f"{MFArrayType.to_string(MFArrayType.external)} "
+                        f"{extpath}{self._external_options(factor, True)}\n"
                     )
-                elif mfa._how == MFArrayType.constant:
-                    lines = (
-                        f"{PAD*2}" + f"{MFArrayType.to_string(mfa._how)} "
-                        f"{str(mfa._value)}\n"
+                elif how == MFArrayType.internal:
+                    lines = f"{PAD*2}" + f"{MFArrayType.to_string(how)}"
+                    if factor:
+                        lines += f" FACTOR {factor}"
+                    f.write(lines + "\n")
+                    self.write_array(f, values, **fmt)
+                elif how == MFArrayType.external:
+                    f.write(
+                        f"{PAD*2}" + f"{MFArrayType.to_string(how)} "
+                        f"{path}{self._external_options(factor, binary)}\n"
+                    )
+                elif how == MFArrayType.constant:
+                    f.write(
+                        f"{PAD*2}" + f"{MFArrayType.to_string(how)} "
+                        f"{str(values.flat[0])}\n"
                     )
-                f.write(lines)
         else:
-            values = self.raw
-            if self._how == MFArrayType.internal:
-                if len(values.shape) == 1:
-                    v = f"\n{PAD*3}"
-                    v += " ".join([str(x) for x in values])
-                elif len(values.shape) == 2:
-                    v = f"\n{PAD*3}"
-                    v = v.join(" ".join(str(x) for x in y) for y in values)
-                elif len(values.shape) == 3:
-                    v = f"{PAD*3}"
-                    for i in range(len(values)):
-                        v += " ".join(
-                            f"\n{PAD*3}" + " ".join(str(x) for x in y)
-                            for y in values[i]
-                        )
+            if (
+                self._how == MFArrayType.internal
+                and threshold is not None
+                and self._value.size > threshold
+            ):
+                extpath = self._write_binary(self.raw, **kwargs)
+                f.write(
+                    f"{PAD}" + f"{self.name.upper()}\n"
+                    f"{PAD*2}"
+                    + f"{MFArrayType.to_string(MFArrayType.external)} "
+                    f"{extpath}{self._external_options(self._factor, True)}\n"
+                )
+            elif self._how == MFArrayType.internal:
                 lines = (
                     f"{PAD}" + f"{self.name.upper()}\n"
                     f"{PAD*2}" + f"{MFArrayType.to_string(self._how)}"
                 )
                 if self._factor:
                     lines += f" FACTOR {self._factor}"
-                lines += f"{v}\n"
+                f.write(lines + "\n")
+                self.write_array(f, self.raw, **fmt)
             elif self._how == MFArrayType.external:
-                lines = (
+                f.write(
                     f"{PAD}" + f"{self.name.upper()}\n"
                     f"{PAD*2}"
-                    + f"{MFArrayType.to_string(self._how)} {self._path}\n"
+                    + f"{MFArrayType.to_string(self._how)} {self._path}"
+                    f"{self._external_options(self._factor, self._binary)}\n"
                 )
             elif self._how == MFArrayType.constant:
-                lines = (
+                f.write(
                     f"{PAD}" + f"{self.name.upper()}\n"
                     f"{PAD*2}" + f"{MFArrayType.to_string(self._how)} "
                     f"{str(self._value)}\n"
                 )
-            f.write(lines)
+
+    def _write_binary(
+        self, values, ilay=None, basepath=None, prefix=None, **kwargs
+    ) -> Path:
+        """
+        Write array values to an external binary file, with a
+        MF6 binary array header, and return the file's path
+        relative to `basepath`. The file isn't rewritten if the
+        array hasn't been modified since it was last written,
+        unless `force` is true.
+        """
+        names = [prefix, self.name, f"layer{ilay}" if ilay else None, "bin"]
+        extpath = Path(".".join(n for n in names if n))
+        fpath = Path(basepath or "") / extpath
+        if (
+            not kwargs.get("force", False)
+            and not self.dirty
+            and fpath in self._binaries
+            and fpath.exists()
+        ):
+            return extpath
+        dtype = np.int32 if values.dtype.kind in "iu" else self._dtype
+        BinaryArray(shape=values.size, dtype=dtype).write(
+            fpath,
+            values,
+            text=self.name,
+            checksum=kwargs.get("checksum", False),
+            renames=kwargs.get("renames"),
+        )
+        self._binaries.add(fpath)
+        return extpath
+
+    @staticmethod
+    def write_array(
+        f, values, columns=None, width=None, digits=None, indent="      "
+    ):
+        """
+        Write array values to an open file, starting a new line
+        for each row (along the last axis) and wrapping rows at
+        `columns` values per line. Values are formatted in blocks
+        with one C-level string formatting call per block, so peak
+        memory is bounded regardless of the array size.
+
+        By default values are written in their shortest exact
+        representation. If `digits` is given, values are written
+        in general format with that many significant digits, or
+        as integers if the array is an integer array. If `width`
+        is given, values are right-aligned to that width.
+        """
+
+        values = np.asarray(values)
+        ncol = values.shape[-1] if values.ndim else 1
+        rows = values.reshape(-1, ncol)
+        columns = min(ncol, columns or _WRAP_COLUMNS)
+        if digits is None:
+            spec = f"%{width or ''}s"
+        elif values.dtype.kind in "iu":
+            spec = f"%{width or ''}d"
+        else:
+            spec = f"%{width or ''}.{digits}G"
+
+        # write whole rows at a time if they are small enough,
+        # otherwise split rows into segments of whole lines
+        seg = columns * max(1, _BLOCK_SIZE // columns)
+        if ncol <= seg:
+            fmt = _line_format(ncol, columns, spec, indent)
+            step = max(1, seg // ncol)
+            for i in range(0, len(rows), step):
+                block = rows[i : i + step]
+                f.write((fmt * len(block)) % tuple(block.ravel().tolist()))
+        else:
+            for row in rows:
+                for j in range(0, ncol, seg):
+                    part = row[j : j + seg]
+                    fmt = _line_format(len(part), columns, spec, indent)
+                    f.write(fmt % tuple(part.tolist()))
 
     @classmethod
     def load(cls, f, cwd, shape, header=True, **kwargs):
         layered = kwargs.pop("layered", False)
+        lazy = kwargs.pop("lazy", False)
 
         if header:
-            tokens = multi_line_strip(f).split()
+            tokens = next_line(f).split()
             name = tokens[0]
             kwargs.pop("name", None)
             if len(tokens) > 1 and tokens[1] == "layered":
@@ -457,86 +781,198 @@ class MFArray(MFParam, NumPyArrayMixin):
         if layered:
             nlay = shape[0]
             lshp = shape[1:]
-            objs = []
-            for _ in range(nlay):
-                mfa = cls._load(f, cwd, lshp, name)
-                objs.append(mfa)
-
-            return MFArray(
+            type = kwargs.get("type")
+            array = np.empty(shape, dtype=_array_dtype(type))
+            layers = []
+            pending = []
+            for i in range(nlay):
+                mfa = cls._load(f, cwd, lshp, name=name, type=type, lazy=lazy)
+                if mfa.deferred:
+                    pending.append(i)
+                else:
+                    array[i] = mfa.raw
+                layers.append(mfa)
+
+            mfa = MFArray(
                 shape,
-                array=np.array(objs, dtype=object),
-                type="array",
-                how=None,
-                factor=None,
+                array=array,
+                type=kwargs.get("type", "array"),
+                how=[mfa._how for mfa in layers],
+                factor=[mfa._factor for mfa in layers],
                 name=name,
                 layered=True,
+                path=[mfa._path for mfa in layers],
+                cwd=cwd,
+                binary=[mfa._binary for mfa in layers],
             )
+            mfa._pending = pending
+            return mfa
         else:
             kwargs.pop("layered", None)
             return cls._load(
-                f, cwd, shape, layered=layered, name=name, **kwargs
+                f, cwd, shape, layered=layered, name=name, lazy=lazy, **kwargs
             )
 
     @classmethod
-    def _load(cls, f, cwd, shape, layered=False, **kwargs):
-        control_line = multi_line_strip(f).split()
+    def _load(cls, f, cwd, shape, layered=False, lazy=False, **kwargs):
+        control_line = next_line(f).split()
 
         if CommonNames.iprn.lower() in control_line:
             idx = control_line.index(CommonNames.iprn.lower())
             control_line.pop(idx + 1)
             control_line.pop(idx)
 
+        factor = None
+        if "factor" in control_line:
+            idx = control_line.index("factor")
+            factor = float(control_line.pop(idx + 1))
+            control_line.pop(idx)
+
         how = MFArrayType.from_string(control_line[0])
+        dtype = _array_dtype(kwargs.get("type"))
+        array = None
         extpath = None
-        clpos = 1
+        binary = False
 
         if how == MFArrayType.internal:
-            array = cls.read_array(f)
+            array = cls.read_array(f, shape, dtype)
 
         elif how == MFArrayType.constant:
-            array = float(control_line[clpos])
-            clpos += 1
+            array = dtype(float(control_line[1]))
 
         elif how == MFArrayType.external:
-            extpath = Path(control_line[clpos])
-            fpath = cwd / extpath
-            with open(fpath) as foo:
-                array = cls.read_array(foo)
-            clpos += 1
+            extpath = Path(control_line[1])
+            binary = "(binary)" in control_line
 
         else:
             raise NotImplementedError()
 
-        factor = None
-        if len(control_line) > 2:
-            factor = float(control_line[clpos + 1])
-
-        return cls(
+        mfa = cls(
             shape,
             array=array,
             how=how,
             factor=factor,
             path=extpath,
+            cwd=cwd,
+            binary=binary,
             **kwargs,
         )
+        if not lazy:
+            mfa._load_external()
+        return mfa
 
     @staticmethod
-    def read_array(f):
+    def read_array(f, shape=None, dtype=np.float64):
         """
         Read a MODFLOW 6 array from an open file
         into a flat NumPy array representation.
+
+        Values are read and parsed a chunk of lines at a time,
+        into a buffer preallocated from `shape`, if it is known,
+        in which case reading stops when the buffer is full.
+        Reading also stops at the first line not beginning with
+        a number. Fortran `D` exponents and `n*value` repeat
+        counts are supported.
         """
 
-        astr = []
-        while True:
-            pos = f.tell()
-            line = f.readline()
-            line = line_strip(line)
-            if not re.match("^[0-9. ]+$", line):
-                f.seek(pos, 0)
-                break
-            astr.append(line)
+        size = None
+        if shape is not None and not isinstance(shape, str):
+            size = math.prod(np.atleast_1d(shape).tolist())
 
-        astr = StringIO(" ".join(astr))
-        array = np.genfromtxt(astr).ravel()
+        if size is None:
+            chunks = []
+        else:
+            array = np.empty(size, dtype=dtype)
+        n = 0
+
+        def flush(values):
+            nonlocal n
+            if size is None:
+                chunks.append(values)
+            elif n + len(values) > size:
+                raise ValueError(f"Expected {size} array values, found more")
+            else:
+                array[n : n + len(values)] = values
+            n += len(values)
+
+        with TokenReader.wrap(f) as f:
+            while size is None or n < size:
+                pos = f.tell()
+                text = f.read_until(_ARRAY_END)
+                if not text:
+                    break
+                values = _parse_text(text)
+                if size is not None and n + len(values) > size:
+                    # the array ends within these lines, so take
+                    # them one at a time and leave the rest
+                    f.seek(pos)
+                    while n < size:
+                        line = f.readline()
+                        if not line:
+                            break
+                        flush(_parse_text(line))
+                    break
+                flush(values)
+
+        if size is None:
+            if not chunks:
+                return np.empty(0, dtype=dtype)
+            return np.concatenate(chunks).astype(dtype, copy=False)
+        if n != size:
+            raise ValueError(f"Expected {size} array values, found {n}")
         return array
+
+
+_ARRAY_END = re.compile(r"^[ \t]*[^-+.0-9 \t\r\n]", re.MULTILINE)
+"""Matches a line not beginning with a number, which ends an array."""
+
+_BLOCK_SIZE = 65536
+"""Number of array values to parse or format at once."""
+
+_WRAP_COLUMNS = 100
+"""Default maximum number of array values per line on write."""
+
+
+def _array_dtype(type):
+    """
+    Return the data type of arrays with the given spec `type`.
+    MF6 reads integer arrays (e.g. `idomain`) as 32-bit integers,
+    and others as doubles.
+    """
+    if type == "integer":
+        return np.int32
+    return np.float64
+
+
+def _parse_text(text) -> np.ndarray:
+    """Parse numeric array input text."""
+    tokens = text.split()
+    if "*" in text or "d" in text or "D" in text:
+        return _parse_tokens(tokens)
+    return np.asarray(tokens, dtype=np.float64)
+
+
+def _parse_tokens(tokens) -> np.ndarray:
+    """
+    Parse numeric tokens which may contain Fortran `D`
+    exponents and/or `n*value` repeat counts.
+    """
+    counts = np.ones(len(tokens), dtype=np.int64)
+    values = []
+    for i, token in enumerate(tokens):
+        if "*" in token:
+            count, token = token.split("*")
+            counts[i] = int(count)
+        values.append(token.replace("d", "e").replace("D", "e"))
+    return np.repeat(np.asarray(values, dtype=np.float64), counts)
+
+
+def _line_format(n, columns, spec, indent) -> str:
+    """
+    Return a format string for `n` values, `columns` per line.
+    """
+    full, rem = divmod(n, columns)
+    fmt = (indent + " ".join([spec] * columns) + "\n") * full
+    if rem:
+        fmt += indent + " ".join([spec] * rem) + "\n"
+    return fmt
@@ -9,9 +9,11 @@ from warnings import warn
 
 from flopy4.array import MFArray
 from flopy4.compound import MFKeystring, MFList, MFRecord, get_compound
+from flopy4.io.tokens import TokenReader
 from flopy4.param import MFParam, MFParams
+from flopy4.resolver import invalidate
 from flopy4.scalar import MFScalar
-from flopy4.utils import find_upper, strip
+from flopy4.utils import find_upper
 
 
 def get_param(params: Dict[str, MFParam], block: str, name: str) -> MFParam:
@@ -35,6 +37,12 @@ def get_param(params: Dict[str, MFParam], block: str, name: str) -> MFParam:
     return param
 
 
+def _new_block(package, name: str) -> "MFBlock":
+    """Create an empty instance of the given package's block class."""
+    cls = type(package.blocks[name])
+    return cls.__new__(cls)
+
+
 def collect_params(
     attrs: Dict[str, Any],
     block_name: Optional[str] = None,
@@ -162,6 +170,15 @@ class MFBlock(MFParams, metaclass=MFBlockMappingMeta):
     def __eq__(self, other):
         return super().__eq__(other)
 
+    def __reduce__(self):
+        # blocks subclassed dynamically by `MFPackage` are
+        # pickled by reference to the package class, e.g.
+        # to send them between processes
+        package = getattr(type(self), "_package", None)
+        if package is None:
+            return super().__reduce__()
+        return _new_block, package, self.__dict__
+
     @property
     def value(self):
         """Get a dictionary of block parameter values."""
@@ -177,6 +194,25 @@ class MFBlock(MFParams, metaclass=MFBlockMappingMeta):
         # coerce the parameter mapping to the spec and set defaults
         params = type(self).coerce(value.copy(), set_default=True)
         MFParams.value.fset(self, params)
+        self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Whether the block, or any of its parameters, has been
+        modified since it was created or last written.
+        """
+        return self.__dict__.get("_dirty", False) or any(
+            p.dirty for p in self.data.values() if p is not None
+        )
+
+    @dirty.setter
+    def dirty(self, value: bool):
+        self._dirty = value
+        if not value:
+            for param in self.data.values():
+                if param is not None:
+                    param.dirty = False
 
     @classmethod
     def coerce(
@@ -230,61 +266,64 @@ class MFBlock(MFParams, metaclass=MFBlockMappingMeta):
 
         mempath = kwargs.pop("mempath", None)
 
-        while True:
-            pos = f.tell()
-            line = f.readline()
-            if line == "":
-                raise ValueError("Early EOF, aborting")
-            if line == "\n":
-                continue
-            words = strip(line).lower().split()
-            key = words[0]
-            if key == "begin":
-                found = True
-                name = words[1]
-                if len(words) > 2 and str.isdigit(words[2]):
-                    index = int(words[2])
-            elif key == "end":
-                break
-            elif found:
-                ptype = None
-                param = get_param(members, block=name, name=key)
-
-                if param is None:
+        with TokenReader.wrap(f) as f:
+            while True:
+                pos = f.tell()
+                line = f.readline()
+                if line == "":
+                    raise ValueError("Early EOF, aborting")
+                words = line.lower().split()
+                if not words:
                     continue
-                param.block = name
-                f.seek(pos)
-                spec = asdict(param)
-                kwrgs = {**kwargs, **spec}
-                ptype = type(param)
-
-                if ptype is MFList:
-                    kwrgs["params"] = param.data.copy()
-                elif ptype is MFRecord:
-                    kwrgs["params"] = param.data.copy()
-                elif ptype is MFKeystring:
-                    kwrgs["params"] = param.data.copy()
-                elif ptype is MFArray:
-                    # TODO: inject from model somehow?
-                    # and remove special handling here
-                    kwrgs["cwd"] = ""
-                    kwrgs["mempath"] = f"{mempath}/{name}"
-                if ptype is not MFArray:
-                    kwrgs.pop("model_shape", None)
-                    kwrgs.pop("blk_params", None)
-
-                params[param.name] = ptype.load(f, **kwrgs)
+                key = words[0]
+                if key == "begin":
+                    found = True
+                    name = words[1]
+                    if len(words) > 2 and str.isdigit(words[2]):
+                        index = int(words[2])
+                elif key == "end":
+                    break
+                elif found:
+                    ptype = None
+                    param = get_param(members, block=name, name=key)
+
+                    if param is None:
+                        continue
+                    param.block = name
+                    f.seek(pos)
+                    spec = asdict(param)
+                    kwrgs = {**kwargs, **spec}
+                    ptype = type(param)
+
+                    if ptype is MFList:
+                        kwrgs["params"] = param.data.copy()
+                    elif ptype is MFRecord:
+                        kwrgs["params"] = param.data.copy()
+                    elif ptype is MFKeystring:
+                        kwrgs["params"] = param.data.copy()
+                    elif ptype is MFArray:
+                        # TODO: inject from model somehow?
+                        # and remove special handling here
+                        kwrgs["cwd"] = ""
+                        kwrgs["mempath"] = f"{mempath}/{name}"
+                    if ptype not in (MFArray, MFList):
+                        kwrgs.pop("model_shape", None)
+                        kwrgs.pop("blk_params", None)
+                    if ptype is not MFArray:
+                        kwrgs.pop("lazy", None)
+
+                    params[param.name] = ptype.load(f, **kwrgs)
 
         return cls(name=name, index=index, params=params)
 
-    def write(self, f):
+    def write(self, f, **kwargs):
         """Write the block to file."""
         index = self.index if self.index is not None else ""
         begin = f"BEGIN {self.name.upper()} {index}\n"
         end = f"END {self.name.upper()}\n"
 
         f.write(begin)
-        super().write(f)
+        super().write(f, **kwargs)
         f.write(end)
 
 
@@ -303,6 +342,14 @@ class MFBlocks(UserDict):
     def __repr__(self):
         return pformat(self.data)
 
+    def __setitem__(self, key, block):
+        invalidate()
+        super().__setitem__(key, block)
+
+    def __delitem__(self, key):
+        invalidate()
+        super().__delitem__(key)
+
     def __eq__(self, other):
         if not isinstance(other, MFBlocks):
             raise TypeError(f"Expected MFBlocks, got {type(other)}")
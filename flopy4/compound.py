@@ -1,17 +1,63 @@
+import re
+import warnings
 from abc import abstractmethod
 from dataclasses import asdict
 from io import StringIO
+from pathlib import Path
 from typing import Any, Dict, Optional
 
 import numpy as np
+from pandas import Categorical, DataFrame
 
 from flopy4.array import MFArray, MFArrayType
+from flopy4.io.tokens import TokenReader, strip
+from flopy4.mf6.binary import CELLID_FIELDS, BinaryList
 from flopy4.param import MFParam, MFParams, MFReader
 from flopy4.scalar import MFDouble, MFInteger, MFScalar
-from flopy4.utils import strip
 
 PAD = "  "
 
+_CHUNK_ROWS = 65536
+"""Number of list rows to parse or format at once."""
+
+_END_LINE = re.compile(r"^[ \t]*end\b", re.IGNORECASE | re.MULTILINE)
+"""Matches the `END` line of a block."""
+
+_GRID_TYPES = {3: "structured", 2: "vertex", 1: "unstructured"}
+"""Grid types by number of cell index dimensions."""
+
+
+def _to_numeric(values, dtype):
+    """
+    Convert a float or string array to the given dtype. Strings
+    may use Fortran `D` exponents.
+    """
+    if values.dtype.kind == "f":
+        return values.astype(dtype)
+    try:
+        return values.astype(np.float64).astype(dtype)
+    except ValueError:
+        values = np.char.replace(np.char.upper(values), "D", "E")
+        return values.astype(np.float64).astype(dtype)
+
+
+def _token_counts(text: str) -> np.ndarray:
+    """
+    Count the whitespace-separated tokens on each non-blank line
+    of the given text, without splitting it line by line.
+    """
+    chars = np.frombuffer(text.encode(), dtype=np.uint8)
+    if not chars.size:
+        return np.zeros(0, dtype=np.intp)
+    space = np.isin(chars, (9, 10, 13, 32))
+    starts = ~space
+    starts[1:] &= space[:-1]
+    lines = np.searchsorted(
+        np.flatnonzero(chars == 10), np.flatnonzero(starts)
+    )
+    counts = np.bincount(lines)
+    return counts[counts > 0]
+
 
 def get_compound(
     params: Dict[str, MFParam], scalar: str = None
@@ -93,6 +139,23 @@ class MFCompound(MFParam, MFParams):
         for key, val in value.items():
             self.data[key].value = val
 
+    @property
+    def dirty(self) -> bool:
+        """
+        Whether the parameter, or any component parameter, has
+        been modified since it was created or last written.
+        """
+        return MFParam.dirty.fget(self) or any(
+            p.dirty for p in self.data.values()
+        )
+
+    @dirty.setter
+    def dirty(self, value: bool):
+        MFParam.dirty.fset(self, value)
+        if not value:
+            for param in self.data.values():
+                param.dirty = False
+
 
 class MFRecord(MFCompound):
     def __init__(
@@ -340,92 +403,400 @@ class MFList(MFCompound):
         blk_params = kwargs.pop("blk_params", {})
         params = kwargs.pop("params", None)
         type = kwargs.pop("type", None)
+        model_shape = kwargs.pop("model_shape", None)
+        cwd = kwargs.pop("cwd", "")
         kwargs.pop("mname", None)
         kwargs.pop("shape", None)
 
-        if list(params.items())[-1][1].shape == "(:)":
-            maxsplit = len(params) - 1
+        nbound = None
+        maxbound = None
+        if blk_params and "dimensions" in blk_params:
+            dims = blk_params.get("dimensions")
+            nbound = dims.get("nbound")
+            maxbound = dims.get("maxbound")
+        naux = None
+        if blk_params and "options" in blk_params:
+            aux = blk_params.get("options").get("auxiliary")
+            aux = getattr(aux, "value", aux)
+            naux = len(str(aux).split()) if aux else 0
+        ncelldim = len(np.atleast_1d(model_shape)) if model_shape else None
+
+        pos = f.tell()
+        words = strip(f.readline()).split()
+        if words and words[0].lower() == "open/close":
+            fpath = Path(cwd) / words[1]
+            if "(binary)" in (w.lower() for w in words[2:]):
+                columns = MFList.read_binary(fpath, params, model_shape)
+            else:
+                with open(fpath) as ext:
+                    columns = MFList.read_columns(
+                        ext, params, nbound or maxbound, ncelldim, naux
+                    )
+        else:
+            f.seek(pos)
+            columns = MFList.read_columns(
+                f, params, nbound or maxbound, ncelldim, naux
+            )
+
+        nrows = len(columns[0]) if columns else 0
+        if nbound and nrows > nbound:
+            raise ValueError("MFList nbound not satisfied")
+        if maxbound and nrows > maxbound:
+            raise ValueError("MFList maxbound not satisfied")
+
+        list_params = MFList.create_list_params(params, columns, **kwargs)
+        return cls(list_params, type=type, **kwargs)
+
+    @staticmethod
+    def read_columns(f, params, nrows=None, ncelldim=None, naux=None) -> list:
+        """
+        Read list rows from a file, up to the end of the block
+        or file, into a column for each parameter. Rows are read
+        and parsed a chunk at a time: numeric columns are converted
+        in bulk to typed arrays, preallocated if the number of rows
+        (or an upper bound, like `maxbound`) is known, and string
+        columns are kept as lists. Cell ids are read into a (nrows,
+        ncelldim) array of zero-based indices, and other array
+        parameters, like auxiliary variables, into (nrows, naux)
+        float arrays.
+        """
+        columns = None
+        offset = 0
+        with TokenReader.wrap(f) as f:
+            while True:
+                text = f.read_until(_END_LINE)
+                if not text:
+                    break
+                if text.isspace():
+                    continue
+                chunk = MFList._parse_rows(text, params, ncelldim, naux)
+                columns = MFList._store(columns, chunk, offset, nrows)
+                offset += len(chunk[0])
+
+        if columns is None:
+            columns = MFList._parse_rows("", params, ncelldim, naux)
+        return [c[:offset] for c in columns]
+
+    @staticmethod
+    def _store(columns, chunk, offset, nrows=None) -> list:
+        """
+        Copy a chunk of parsed rows into the columns at the given
+        offset, allocating (or growing) the columns if needed.
+        """
+        if columns is None:
+            if nrows is None:
+                return chunk
+            columns = [
+                c[:0]
+                if isinstance(c, list)
+                else np.empty((max(nrows, len(c)),) + c.shape[1:], c.dtype)
+                for c in chunk
+            ]
+
+        end = offset + len(chunk[0])
+        for i, c in enumerate(chunk):
+            if isinstance(c, list):
+                columns[i].extend(c)
+                continue
+            if len(columns[i]) < end:
+                grown = np.empty(
+                    (max(end, 2 * len(columns[i])),) + c.shape[1:], c.dtype
+                )
+                grown[:offset] = columns[i][:offset]
+                columns[i] = grown
+            columns[i][offset:end] = c
+        return columns
+
+    @staticmethod
+    def _parse_rows(text, params, ncelldim=None, naux=None) -> list:
+        """
+        Parse list rows, cleaned of comments, into a column for
+        each parameter. If all parameters are numeric, the whole
+        text is converted with a single call to NumPy, otherwise
+        rows are split and the columns converted from a string
+        array.
+        """
+        kinds = [MFList._kind(p) for p in params.values()]
+        if "s" not in kinds:
+            with warnings.catch_warnings():
+                # malformed tokens (e.g. Fortran D exponents) end the
+                # parse early, with a warning or error depending on
+                # the NumPy version; we then fall back to splitting
+                warnings.simplefilter("ignore", DeprecationWarning)
+                try:
+                    values = np.fromstring(text, sep=" ")
+                except ValueError:
+                    values = np.empty(0)
+            # every row must have the same number of values,
+            # not just the right number of values in total
+            counts = _token_counts(text)
+            nrows = len(counts)
+            ncols = int(counts[0]) if nrows else 0
+            widths = MFList._widths(kinds, ncols, ncelldim, naux)
+            if (
+                nrows
+                and widths is not None
+                and (counts == ncols).all()
+                and values.size == nrows * ncols
+            ):
+                return MFList._split_columns(
+                    values.reshape(-1, ncols), kinds, widths
+                )
+
+        if params and list(params.values())[-1].shape == "(:)":
+            maxsplit = (
+                len(params) - 1 + ((ncelldim or 1) - 1 if "c" in kinds else 0)
+            )
         else:
             maxsplit = -1
+        rows = [line.split(maxsplit=maxsplit) for line in text.splitlines()]
+        rows = [row for row in rows if row]
+        ncols = len(rows[0]) if rows else len(kinds)
+        if any(len(row) != ncols for row in rows):
+            raise ValueError("MFList rows must have the same number of values")
+        widths = MFList._widths(kinds, ncols, ncelldim, naux)
+        if widths is None:
+            raise ValueError(
+                f"MFList rows of {ncols} values don't match the parameters"
+            )
+        return MFList._split_columns(
+            np.array(rows, dtype=str).reshape(-1, ncols), kinds, widths
+        )
 
-        param_lists = []
-        # TODO: support multi-dimensional params
-        for i in range(len(params)):
-            param_lists.append(list())
+    @staticmethod
+    def _kind(param) -> str:
+        """
+        Column kind: (c)ellid, other (a)rray, (f)loat, (i)nteger
+        or (s)tring.
+        """
+        if type(param) is MFArray:
+            return "c" if param.shape == "(ncelldim)" else "a"
+        if type(param) is MFDouble:
+            return "f"
+        if type(param) is MFInteger:
+            return "i"
+        return "s"
 
-        while True:
-            pos = f.tell()
-            line = f.readline()
-            if line.lower().startswith("end"):
-                f.seek(pos)
-                break
+    @staticmethod
+    def _widths(kinds, ncols, ncelldim=None, naux=None) -> Optional[list]:
+        """
+        Get the number of values in each column of rows with the
+        given number of values, or None if they don't match. Cell
+        ids have `ncelldim` values and other arrays `naux` values.
+        If either is unknown, the columns of that kind share the
+        values left over, if there is only one such kind.
+        """
+        widths = [
+            ncelldim if k == "c" else naux if k == "a" else 1 for k in kinds
+        ]
+        unknown = [i for i, w in enumerate(widths) if w is None]
+        rest = ncols - sum(w for w in widths if w is not None)
+        if not unknown:
+            return widths if rest == 0 else None
+        if len({kinds[i] for i in unknown}) > 1 or rest < 0:
+            return None
+        width, remainder = divmod(rest, len(unknown))
+        if remainder or (width == 0 and kinds[unknown[0]] == "c"):
+            return None
+        for i in unknown:
+            widths[i] = width
+        return widths
+
+    @staticmethod
+    def _split_columns(values, kinds, widths) -> list:
+        """Split a 2D (numeric or string) row array into columns."""
+        columns = []
+        j = 0
+        for kind, width in zip(kinds, widths):
+            wide = kind in "ca"
+            col = values[:, j : j + width] if wide else values[:, j]
+            j += width
+            if kind == "s":
+                columns.append(col.tolist())
+            elif kind in "fa":
+                columns.append(_to_numeric(col, np.float64))
             else:
-                tokens = strip(line).split(maxsplit=maxsplit)
-                assert len(tokens) == len(param_lists)
-                for i, token in enumerate(tokens):
-                    param_lists[i].append(token)
+                col = _to_numeric(col, np.int32)
+                columns.append(col - 1 if kind == "c" else col)
+        return columns
 
-        if blk_params and "dimensions" in blk_params:
-            nbound = blk_params.get("dimensions").get("nbound")
-            if nbound:
-                for param_list in param_lists:
-                    if len(param_list) > nbound:
-                        raise ValueError("MFList nbound not satisfied")
+    @staticmethod
+    def read_binary(
+        fpath, params: Dict[str, MFParam], model_shape=None
+    ) -> list:
+        """
+        Read list input from an external binary file into a
+        column for each parameter. Cell ids are converted to
+        zero-based indices. Only numeric list parameters are
+        supported.
+        """
+        ndim = len(np.atleast_1d(model_shape)) if model_shape else 3
+        grid_type = _GRID_TYPES[ndim]
+        fields = []
+        for param_name, param in params.items():
+            kind = MFList._kind(param)
+            if kind == "c":
+                continue
+            if kind == "f":
+                fields.append((param_name, np.float64))
+            elif kind == "i":
+                fields.append((param_name, np.int32))
+            else:
+                raise ValueError(
+                    f"Binary list input does not support {param_name}"
+                )
 
-        list_params = MFList.create_list_params(params, param_lists, **kwargs)
-        return cls(list_params, type=type, **kwargs)
+        binary = BinaryList(grid_type=grid_type, fields=fields)
+        columns = binary.read_columns(fpath)
+        cellid = columns.pop("cellid")
+        return [
+            cellid if MFList._kind(p) == "c" else columns[n]
+            for n, p in params.items()
+        ]
 
     @staticmethod
     def create_list_params(
         params: Dict[str, MFParam],
-        param_lists: list,
+        columns: list,
         **kwargs,
     ) -> Dict[str, MFParam]:
         """Create the param dictionary"""
-        idx = 0
         list_params = dict()
-        for param_name, param in params.items():
-            if type(param) is MFDouble:
-                list_params[param_name] = MFArray(
-                    shape=len(param_lists[idx]),
-                    array=np.array(param_lists[idx], dtype=np.float64),
-                    how=MFArrayType.internal,
-                    factor=1.0,
-                    path=None,
-                    **kwargs,
-                )
-            elif type(param) is MFInteger:
-                list_params[param_name] = MFArray(
-                    shape=len(param_lists[idx]),
-                    array=np.array(param_lists[idx], dtype=np.int32),
-                    how=MFArrayType.internal,
-                    factor=1,
-                    path=None,
-                    **kwargs,
-                )
-            else:
+        for (param_name, param), column in zip(params.items(), columns):
+            kind = MFList._kind(param)
+            if kind == "s":
                 list_params[param_name] = MFScalarList(
-                    value=param_lists[idx],
+                    value=column
+                    if isinstance(column, Categorical)
+                    else list(column),
                     type=type(param),
                     **kwargs,
                 )
-
-            idx += 1
+                continue
+            dtype = np.float64 if kind in "fa" else np.int32
+            array = np.asarray(column, dtype=dtype)
+            list_params[param_name] = MFArray(
+                shape=array.shape,
+                array=array,
+                how=MFArrayType.internal,
+                factor=1.0 if kind in "fa" else 1,
+                path=None,
+                **kwargs,
+            )
         return list_params
 
-    def write(self, f, **kwargs):
-        """Write the list to file."""
-        # TODO: numpy numeric data, remove trailing tab
-        PAD = "  "
-        count = 0
-
+    def to_dataframe(self) -> DataFrame:
+        """
+        Return the list as a `DataFrame` with a column for each
+        parameter, or for each cell index (e.g. layer, row, col)
+        if the parameter is a cell id, or numbered from 1 (e.g.
+        aux1, aux2) for other array parameters. Numeric columns share the
+        list's memory unless a factor must be applied. String
+        columns, like boundnames, are stored as categoricals.
+        """
+        data = dict()
         for name, param in self.params.items():
-            if count == 0:
-                count = len(param.value)
+            if not isinstance(param, MFArray):
+                data[name] = Categorical(param.value)
+                continue
+            factor = param.factor
+            values = param.raw if factor in (None, 1) else param.value
+            if values.ndim > 1 and values.dtype.kind in "iu":
+                fields = CELLID_FIELDS[_GRID_TYPES[values.shape[1]]]
+                for j, field in enumerate(fields):
+                    data[field] = values[:, j]
+            elif values.ndim > 1:
+                for j in range(values.shape[1]):
+                    data[f"{name}{j + 1}"] = values[:, j]
+            else:
+                data[name] = values
+        return DataFrame(data, copy=False)
+
+    @classmethod
+    def from_dataframe(
+        cls, df: DataFrame, params: Dict[str, MFParam], **kwargs
+    ) -> "MFList":
+        """
+        Create a list with the given component parameters from a
+        `DataFrame`, e.g. as returned by `to_dataframe`. Numeric
+        columns of the expected dtype are used without copying.
+        A cell id is assembled from its cell index columns, and
+        string columns are kept as categoricals.
+        """
+        columns = []
+        for name, param in params.items():
+            kind = MFList._kind(param)
+            if kind == "c":
+                fields = [
+                    f
+                    for f in CELLID_FIELDS.values()
+                    if all(c in df.columns for c in f)
+                ]
+                if not any(fields):
+                    raise ValueError(f"No cell index columns for {name}")
+                fields = fields[0]
+                columns.append(df[fields].to_numpy(dtype=np.int32))
+            elif kind == "a":
+                fields = []
+                while f"{name}{len(fields) + 1}" in df.columns:
+                    fields.append(f"{name}{len(fields) + 1}")
+                columns.append(df[fields].to_numpy(dtype=np.float64))
+            elif kind == "s":
+                columns.append(Categorical(df[name]))
+            else:
+                dtype = np.float64 if kind == "f" else np.int32
+                columns.append(df[name].to_numpy(dtype=dtype, copy=False))
+        kwargs.setdefault("type", "recarray")
+        return cls(MFList.create_list_params(params, columns), **kwargs)
+
+    def write(self, f, **kwargs):
+        """
+        Write the list to file. Each column is pulled from its
+        parameter once, and rows are formatted in chunks with one
+        C-level string formatting call per chunk. If `width` is
+        given, values are right-aligned to that width. If `digits`
+        is given, floating point values are written in general
+        format with that many significant digits, otherwise in
+        their shortest exact representation.
+        """
+        width = kwargs.get("width") or ""
+        digits = kwargs.get("digits")
+        columns = []
+        specs = []
+        for param in self.params.values():
+            value = param.value
+            if not isinstance(value, np.ndarray):
+                columns.append(list(value))
+                specs.append(f"%{width}s")
+            elif value.ndim > 1 and value.dtype.kind in "iu":
+                # cell ids are stored zero-based
+                cellid = value.reshape(len(value), -1) + 1
+                columns.extend(cellid.T)
+                specs.extend([f"%{width}d"] * cellid.shape[1])
+            elif value.ndim > 1:
+                value = value.reshape(len(value), -1)
+                columns.extend(value.T)
+                specs.extend(
+                    [f"%{width}s" if digits is None else f"%{width}.{digits}G"]
+                    * value.shape[1]
+                )
+            elif value.dtype.kind == "f":
+                columns.append(value)
+                specs.append(
+                    f"%{width}s" if digits is None else f"%{width}.{digits}G"
+                )
             else:
-                assert len(param.value) == count
-        for i in range(count):
-            line = f"{PAD}"
-            for name, param in self.params.items():
-                line += f"{param.value[i]}\t"
-            f.write(line + "\n")
+                columns.append(value)
+                specs.append(f"%{width}d")
+
+        count = len(columns[0]) if columns else 0
+        if any(len(column) != count for column in columns):
+            raise ValueError("MFList columns must have the same length")
+
+        fmt = PAD + " ".join(specs) + "\n"
+        for i in range(0, count, _CHUNK_ROWS):
+            n = min(_CHUNK_ROWS, count - i)
+            rows = np.empty((n, len(columns)), dtype=object)
+            for j, column in enumerate(columns):
+                rows[:, j] = column[i : i + n]
+            f.write((fmt * n) % tuple(rows.ravel().tolist()))
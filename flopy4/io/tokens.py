@@ -0,0 +1,251 @@
+"""
+Tokenize free-format MODFLOW 6 input. Comments begin with
+`//`, `#` or `!` and run to the end of the line, and commas
+separate values like whitespace.
+
+Files are read in large chunks, and each chunk is cleaned in
+one pass: comments are blanked out and commas replaced with
+spaces. Cleaning preserves the length of the text, so offsets
+into a cleaned chunk are offsets into the file. `read_chunks`
+yields cleaned chunks of a file, e.g. to scan it for blocks,
+and `TokenReader` reads them like a file for the loaders,
+which may take a line at a time or a run of lines at once.
+"""
+
+import re
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import IO, AnyStr, Iterator, List, Pattern, Tuple
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+"""Number of bytes or characters to read from a file at once."""
+
+COMMENT_FLAGS = ("//", "#", "!")
+"""Strings which begin a comment."""
+
+_COMMENT = re.compile(r"(?://|#|!)[^\r\n]*")
+
+
+def _blank(match) -> str:
+    return " " * len(match.group())
+
+
+def _blank_comments(chars: np.ndarray):
+    """Blank out comments in place in an array of ASCII codes."""
+    flags = (chars == ord("#")) | (chars == ord("!"))
+    flags[:-1] |= (chars[:-1] == ord("/")) & (chars[1:] == ord("/"))
+    starts = np.flatnonzero(flags)
+    if not starts.size:
+        return
+    newlines = (chars == ord("\n")) | (chars == ord("\r"))
+    newlines = np.append(np.flatnonzero(newlines), chars.size)
+    # a comment runs from the first flag on a line to its end
+    lines = np.searchsorted(newlines, starts)
+    first = np.ones(lines.size, dtype=bool)
+    first[1:] = lines[1:] != lines[:-1]
+    delta = np.zeros(chars.size + 1, dtype=np.int8)
+    delta[starts[first]] = 1
+    delta[newlines[lines[first]]] = -1
+    blank = np.cumsum(delta[:-1], dtype=np.int8).astype(bool)
+    chars[blank] = ord(" ")
+
+
+def clean(text: AnyStr) -> AnyStr:
+    """
+    Blank out comments and replace commas with spaces in a
+    chunk of input text or bytes, preserving its length.
+    ASCII input is cleaned in bulk with NumPy.
+    """
+    if isinstance(text, str) and not text.isascii():
+        text = _COMMENT.sub(_blank, text)
+        return text.replace(",", " ")
+    data = text if isinstance(text, bytes) else text.encode("ascii")
+    if b"#" in data or b"!" in data or b"//" in data:
+        chars = np.frombuffer(data, dtype=np.uint8).copy()
+        _blank_comments(chars)
+        data = chars.tobytes()
+    data = data.replace(b",", b" ")
+    return data if isinstance(text, bytes) else data.decode("ascii")
+
+
+def _read_chunk(f: IO, size: int) -> AnyStr:
+    """Read a chunk of whole lines from the file."""
+    text = f.read(size)
+    newline = b"\n" if isinstance(text, bytes) else "\n"
+    if text and not text.endswith(newline):
+        text += f.readline()
+    return text
+
+
+def read_chunks(f: IO, size: int = CHUNK_SIZE) -> Iterator[Tuple[int, AnyStr]]:
+    """
+    Read a file in cleaned chunks of whole lines, from its
+    current position. Yields each chunk with its offset from
+    that position, in bytes if the file was opened in binary
+    mode and in characters otherwise.
+    """
+    offset = 0
+    while True:
+        text = _read_chunk(f, size)
+        if not text:
+            return
+        yield offset, clean(text)
+        offset += len(text)
+
+
+def strip(line: str) -> str:
+    """
+    Remove comments and replace commas from input text
+    for a free formatted modflow input file
+
+    Parameters
+    ----------
+        line : str
+            a line of text from a modflow input file
+
+    Returns
+    -------
+        str : line with comments removed and commas replaced
+    """
+    for flag in COMMENT_FLAGS:
+        if flag in line:
+            line = line.split(flag, 1)[0]
+    line = line.strip()
+    return line.replace(",", " ") if "," in line else line
+
+
+def split(line: str, lower: bool = True) -> List[str]:
+    """
+    Split a line of input into tokens, with comments removed,
+    lower-cased unless `lower` is false.
+    """
+    line = strip(line)
+    return (line.lower() if lower else line).split()
+
+
+def next_line(f: IO[str]) -> str:
+    """
+    Read the next line from the file which is not blank or a
+    comment, with comments removed and lower-cased. Returns an
+    empty string at the end of the file.
+    """
+    while True:
+        line = f.readline()
+        if not line:
+            return ""
+        line = strip(line)
+        if line:
+            return line.lower()
+
+
+class TokenReader:
+    """
+    Read a text file in cleaned chunks (see `clean`), through a
+    file-like interface: `readline`, `tell` and `seek`. Lines
+    have comments blanked out and commas replaced, but are not
+    otherwise changed. `read_until` reads a run of lines at once.
+
+    Loaders hand one reader to nested loaders, which may seek
+    back to any position from `tell`. Positions are character
+    offsets from where the file was when the reader was made.
+    The file itself is read ahead, so use `wrap` to read from
+    a file and leave it positioned after what was read.
+    """
+
+    def __init__(self, f: IO[str], size: int = CHUNK_SIZE):
+        self._f = f
+        self._size = size
+        self._chunk = ""
+        self._offset = 0
+        self._pos = 0
+        self._starts: List[int] = []
+        self._marks: List[int] = []
+
+    @classmethod
+    @contextmanager
+    def wrap(cls, f) -> Iterator["TokenReader"]:
+        """
+        Read from the given file, or reader, with a reader. On
+        exit a new reader positions the file after the text it
+        read, so the file can be passed on to other readers.
+        """
+        if isinstance(f, cls):
+            yield f
+            return
+        reader = cls(f)
+        yield reader
+        reader.sync()
+
+    def _load(self, offset: int, mark) -> bool:
+        """Read the chunk at the given offset and file position."""
+        text = _read_chunk(self._f, self._size)
+        if not text:
+            return False
+        if not self._starts or offset > self._starts[-1]:
+            self._starts.append(offset)
+            self._marks.append(mark)
+        self._chunk = clean(text)
+        self._offset = offset
+        self._pos = 0
+        return True
+
+    def _next(self) -> bool:
+        """Read the next chunk, returning false at end of file."""
+        if self._pos < len(self._chunk):
+            return True
+        return self._load(self._offset + len(self._chunk), self._f.tell())
+
+    def readline(self) -> str:
+        """Read the next line, or return "" at end of file."""
+        if not self._next():
+            return ""
+        end = self._chunk.find("\n", self._pos) + 1 or len(self._chunk)
+        line = self._chunk[self._pos : end]
+        self._pos = end
+        return line
+
+    def read_until(self, pattern: Pattern[str]) -> str:
+        """
+        Read whole lines up to the first which matches the given
+        multi-line pattern, or the end of the file, but no further
+        than the end of the current chunk. Returns "" if the next
+        line matches or at the end of the file, so call this until
+        it does to read all lines up to the matching one.
+        """
+        if not self._next():
+            return ""
+        match = pattern.search(self._chunk, self._pos)
+        end = match.start() if match else len(self._chunk)
+        text = self._chunk[self._pos : end]
+        self._pos = end
+        return text
+
+    def tell(self) -> int:
+        return self._offset + self._pos
+
+    def seek(self, pos: int, whence: int = 0):
+        if whence != 0:
+            raise ValueError("TokenReader can only seek from the start")
+        if not self._offset <= pos <= self._offset + len(self._chunk):
+            i = bisect_right(self._starts, pos) - 1
+            if i < 0:
+                raise ValueError(f"Can't seek to {pos}, before the start")
+            self._f.seek(self._marks[i])
+            if not self._load(self._starts[i], self._marks[i]):
+                raise ValueError(f"Can't seek to {pos}, past the end")
+        self._pos = pos - self._offset
+        if self._pos > len(self._chunk):
+            raise ValueError(f"Can't seek to {pos}, past the end")
+
+    def sync(self):
+        """
+        Position the file after the text that has been read, by
+        re-reading the current chunk up to the reader's position.
+        """
+        if self._pos == len(self._chunk):
+            return
+        i = bisect_right(self._starts, self._offset) - 1
+        self._f.seek(self._marks[i])
+        self._f.read(self._pos)
@@ -247,7 +247,7 @@ model output netcdf file.""",
     )
 
     idomain = MFArray(
-        type = "array",
+        type = "integer",
         block = "griddata",
         shape = "(ncol, nrow, nlay)",
         reader = "readarray",
@@ -1,359 +1,279 @@
+import os
+
 import numpy as np
 from flopy.utils.binaryfile import BinaryHeader
+from numpy.lib.recfunctions import structured_to_unstructured
 
+from flopy4.utils import atomic_write, checksum_path, digest, read_checksum
 
-# todo: clean this up to not need model information beyond grid_type,
-#  shape, data header, data dtype, and filename, (optional, modelname,
-#  pakname)
-#  this is still a huge mess and needs a lot of cleanup to be an independent
-#  module
-class BinaryException(Exception):
-    def __init__(self, *args):
-        super.__init__(*args)
+BINTYPES = {
+    "structured": "vardis",
+    "vertex": "vardisv",
+    "unstructured": "vardisu",
+}
 
+CELLID_FIELDS = {
+    "structured": ["layer", "row", "col"],
+    "vertex": ["layer", "cell2d"],
+    "unstructured": ["node"],
+}
 
-class BinaryArray:
-    def __init__(self):
-        self._pos = 0
 
-    def read_binary_data_from_file(
-        self,
-        fname,
-        data_shape,
-        data_size,
-        data_type,
-        modelgrid,
-        read_multi_layer=False,
-    ):
-        import flopy.utils.binaryfile as bf
+class BinaryException(Exception):
+    pass
 
-        if not isinstance(modelgrid.ncpl, np.ndarray):
-            if data_size != modelgrid.ncpl:
-                read_multi_layer = True
 
-        fd = _open_ext_file(fname, True)
-        numpy_type, name = self.datum_to_numpy_type(data_type)
-        header_dtype = bf.BinaryHeader.set_dtype(
-            bintype=self._get_bintype(modelgrid), precision="double"
+def _check_size(fname, itemsize, count):
+    """
+    Make sure the file holds exactly `count` records of the
+    given size before reading (or mapping) it.
+    """
+    size = os.path.getsize(fname)
+    if size != itemsize * count:
+        raise BinaryException(
+            f"Binary file {fname} does not contain expected data. "
+            f"Expected {itemsize * count} bytes but found {size}."
         )
-        if read_multi_layer and len(data_shape) > 1:
-            try:
-                all_data = np.empty(data_shape, numpy_type)
-                headers = []
-                layer_shape = data_shape[1:]
-                layer_data_size = int(data_size / data_shape[0])
-                for index in range(0, data_shape[0]):
-                    layer_data = self._read_binary_file_layer(
-                        fd,
-                        fname,
-                        header_dtype,
-                        numpy_type,
-                        layer_data_size,
-                        layer_shape,
-                    )
-                    all_data[index, :] = layer_data[0]
-                    headers.append(layer_data[1])
-                fd.close()
-                return all_data, headers
-            except BinaryException:
-                fd.seek(self._pos, 0)
-                bin_data = self._read_binary_file_layer(
-                    fd, fname, header_dtype, numpy_type, data_size, data_shape
-                )
-                self._pos = fd.tell()
-                fd.close()
-                return bin_data
-        else:
-            bin_data = self._read_binary_file_layer(
-                fd, fname, header_dtype, numpy_type, data_size, data_shape
-            )
-            fd.close()
-            return bin_data
 
-    def _get_header(
-        self,
-        modelgrid,
-        modeltime,
-        stress_period,
-        precision,
-        text,
-        fname,
-        ilay=None,
-        data=None,
-    ):
-        # handle dis (row, col, lay), disv (ncpl, lay), and disu (nodes) cases
-        if modelgrid is not None and modeltime is not None:
-            pertim = modeltime.perlen[stress_period]
-            totim = modeltime.perlen.sum()
-            if ilay is None:
-                ilay = modelgrid.nlay
-            if modelgrid.grid_type == "structured":
-                m1, m2, m3 = modelgrid.ncol, modelgrid.nrow, ilay
-                if data is not None:
-                    shape3d = modelgrid.nlay * modelgrid.nrow * modelgrid.ncol
-                    if data.size == shape3d:
-                        m1, m2, m3 = shape3d, 1, 1
-                return BinaryHeader.create(
-                    bintype="vardis",
-                    precision=precision,
-                    text=text,
-                    m1=m1,
-                    m2=m2,
-                    m3=m3,
-                    pertim=pertim,
-                    totim=totim,
-                    kstp=1,
-                    kper=stress_period + 1,
-                )
-            elif modelgrid.grid_type == "vertex":
-                if ilay is None:
-                    ilay = modelgrid.nlay
-                m1, m2, m3 = modelgrid.ncpl, 1, ilay
-                if data is not None:
-                    shape3d = modelgrid.nlay * modelgrid.ncpl
-                    if data.size == shape3d:
-                        m1, m2, m3 = shape3d, 1, 1
-                return BinaryHeader.create(
-                    bintype="vardisv",
-                    precision=precision,
-                    text=text,
-                    m1=m1,
-                    m2=m2,
-                    m3=m3,
-                    pertim=pertim,
-                    totim=totim,
-                    kstp=1,
-                    kper=stress_period,
-                )
-            elif modelgrid.grid_type == "unstructured":
-                m1, m2, m3 = modelgrid.nnodes, 1, 1
-                return BinaryHeader.create(
-                    bintype="vardisu",
-                    precision=precision,
-                    text=text,
-                    m1=m1,
-                    m2=1,
-                    m3=1,
-                    pertim=pertim,
-                    totim=totim,
-                    kstp=1,
-                    kper=stress_period,
-                )
-            else:
-                if ilay is None:
-                    ilay = 1
-                m1, m2, m3 = 1, 1, ilay
-                header = BinaryHeader.create(
-                    bintype="vardis",
-                    precision=precision,
-                    text=text,
-                    m1=m1,
-                    m2=m2,
-                    m3=m3,
-                    pertim=pertim,
-                    totim=totim,
-                    kstp=1,
-                    kper=stress_period,
-                )
 
-        else:
-            m1, m2, m3 = 1, 1, 1
-            pertim = np.float64(1.0)
-            header = BinaryHeader.create(
-                bintype="vardis",
-                precision=precision,
-                text=text,
-                m1=m1,
-                m2=m2,
-                m3=m3,
-                pertim=pertim,
-                totim=pertim,
-                kstp=1,
-                kper=stress_period,
-            )
+class BinaryArray:
+    """
+    Reads and writes MODFLOW 6 binary input arrays.
 
-        return header
+    A binary array file consists of a header record followed
+    by the array values, either once for the whole array or,
+    if layered, once per layer. Each layout is described by a
+    single structured dtype so the file can be read with one
+    `np.fromfile` call, or mapped with one `np.memmap`. If the
+    shape is not given, it's inferred from the first header on
+    read (for non-layered files).
+    """
 
-    def _write_layer(
+    def __init__(
         self,
-        fd,
-        data,
-        modelgrid,
-        modeltime,
-        stress_period,
-        precision,
-        text,
-        fname,
-        ilay=None,
+        grid_type="structured",
+        shape=None,
+        dtype=np.float64,
+        precision="double",
     ):
-        header_data = self._get_header(
-            modelgrid,
-            modeltime,
-            stress_period,
-            precision,
-            text,
-            fname,
-            ilay=ilay,
-            data=data,
+        if grid_type not in BINTYPES:
+            raise ValueError(f"Unsupported grid type: {grid_type}")
+        self.grid_type = grid_type
+        self.shape = (
+            None if shape is None else tuple(np.atleast_1d(shape).tolist())
         )
-        header_data.tofile(fd)
-        data.tofile(fd)
+        self.dtype = np.dtype(dtype)
+        self.precision = precision
 
-    def _read_binary_file_layer(
-        self, fd, fname, header_dtype, numpy_type, data_size, data_shape
-    ):
-        header_data = np.fromfile(fd, dtype=header_dtype, count=1)
-        data = np.fromfile(fd, dtype=numpy_type, count=data_size)
-        data = self._resolve_cellid_numbers_from_file(data)
-        if data.size != data_size:
-            message = (
-                "Binary file {} does not contain expected data. "
-                "Expected array size {} but found size "
-                "{}.".format(fname, data_size, data.size)
-            )
-            type_, value_, traceback_ = sys.exc_info()
+    @property
+    def header_dtype(self) -> np.dtype:
+        """Header record dtype."""
+        return BinaryHeader.set_dtype(
+            bintype=BINTYPES[self.grid_type], precision=self.precision
+        )
+
+    def _shape(self, fname, layered=False):
+        """Return the array shape, reading it from file if need be."""
+        if self.shape is not None:
+            return self.shape
+        if layered:
             raise BinaryException(
-                self._data_dimensions.structure.get_model(),
-                self._data_dimensions.structure.get_package(),
-                self._data_dimensions.structure.path,
-                "opening external file for writing",
-                self.structure.name,
-                inspect.stack()[0][3],
-                type_,
-                value_,
-                traceback_,
-                message,
-                self._simulation_data.debug,
+                "Layered binary array shape must be specified"
             )
-        return data.reshape(data_shape), header_data
+        header = np.fromfile(fname, dtype=self.header_dtype, count=1)
+        if not header.size:
+            raise BinaryException(f"Binary file {fname} has no header")
+        return (int(header["m1"][0] * header["m2"][0] * header["m3"][0]),)
+
+    def _records(self, shape, layered=False):
+        """Return the record count and dtype for the file layout."""
+        nrec = shape[0] if layered else 1
+        count = int(np.prod(shape)) // nrec
+        dtype = np.dtype(
+            [("header", self.header_dtype), ("data", self.dtype, (count,))]
+        )
+        return nrec, dtype
+
+    def _read_records(self, fname, shape, layered=False, memmap=False):
+        nrec, dtype = self._records(shape, layered)
+        _check_size(fname, dtype.itemsize, nrec)
+        if memmap:
+            return np.memmap(fname, dtype=dtype, mode="c", shape=(nrec,))
+        return np.fromfile(fname, dtype=dtype, count=nrec)
+
+    def read(self, fname, layered=False, memmap=False) -> np.ndarray:
+        """
+        Read the array from file. If `memmap` is true the file
+        is mapped copy-on-write rather than read, so only pages
+        which are accessed are loaded and changes to the array
+        are not written back.
+        """
+        shape = self._shape(fname, layered)
+        records = self._read_records(fname, shape, layered, memmap)
+        return records["data"].reshape(shape)
 
-    def write_binary_file(
+    def read_headers(self, fname, layered=False) -> np.ndarray:
+        """Read the header record(s) from file."""
+        shape = self._shape(fname, layered)
+        return self._read_records(fname, shape, layered, memmap=True)["header"]
+
+    def write(
         self,
-        data,
         fname,
+        data,
         text,
-        modelgrid=None,
-        modeltime=None,
-        stress_period=0,
-        precision="double",
-        write_multi_layer=False,
+        layered=False,
+        kstp=1,
+        kper=1,
+        pertim=1.0,
+        totim=1.0,
+        checksum=False,
+        renames=None,
     ):
-        data = self._resolve_cellid_numbers_to_file(data)
-        fd = _open_ext_file(fname, binary=True, write=True)
-        if data.size == modelgrid.nnodes:
-            write_multi_layer = False
-        if write_multi_layer:
-            # write data from each layer with a separate header
-            for layer, value in enumerate(data):
-                self._write_layer(
-                    fd,
-                    value,
-                    modelgrid,
-                    modeltime,
-                    stress_period,
-                    precision,
-                    text,
-                    fname,
-                    layer + 1,
-                )
+        """
+        Write the array to file, with a header for the whole
+        array or, if layered, for each layer. If `checksum` is
+        true, a checksum file is written alongside the file,
+        and the file is not rewritten if its content matches.
+        Otherwise any existing checksum file is rewritten with
+        the file, rather than left stale. If a `renames` list
+        is given, files are left to be renamed into place by
+        the caller, as by `atomic_write`.
+        """
+        nrec, dtype = self._records(self.shape, layered)
+        records = np.zeros(nrec, dtype=dtype)
+        header = records["header"]
+        header["kstp"] = kstp
+        header["kper"] = kper
+        header["pertim"] = pertim
+        header["totim"] = totim
+        header["text"] = f"{text.upper()[:16]:<16}"
+        count = dtype["data"].shape[0]
+        if layered:
+            if self.grid_type == "structured" and len(self.shape) == 3:
+                header["m1"] = self.shape[2]
+                header["m2"] = self.shape[1]
+            else:
+                header["m1"] = count
+                header["m2"] = 1
+            header["m3"] = np.arange(1, nrec + 1)
         else:
-            # write data with a single header
-            self._write_layer(
-                fd,
-                data,
-                modelgrid,
-                modeltime,
-                stress_period,
-                precision,
-                text,
-                fname,
-            )
-        fd.close()
+            header["m1"] = count
+            header["m2"] = 1
+            header["m3"] = 1
+        records["data"] = np.reshape(data, (nrec, count))
+        hexdigest = None
+        if checksum or checksum_path(fname).exists():
+            hexdigest = digest(records.tobytes())
+            if checksum and read_checksum(fname) == hexdigest:
+                return
+        with atomic_write(fname, "wb", renames) as f:
+            records.tofile(f)
+        if hexdigest is not None:
+            with atomic_write(checksum_path(fname), "w", renames) as f:
+                f.write(hexdigest)
 
 
 class BinaryList:
-    def __init__(self):
-        pass
+    """
+    Reads and writes MODFLOW 6 binary input lists.
 
-    def read_binary_data_from_file(
-        self, read_file, modelgrid, precision="double", build_cellid=True
+    A binary list file has no header, only fixed-size records
+    of (one-based) integer cell indices followed by the values.
+    `fields` is a list of `(name, dtype)` pairs describing the
+    value columns.
+    """
+
+    def __init__(
+        self, grid_type="structured", fields=None, precision="double"
     ):
-        # read from file
-        header, int_cellid_indexes, ext_cellid_indexes = self._get_header(
-            modelgrid, precision
+        if grid_type not in BINTYPES:
+            raise ValueError(f"Unsupported grid type: {grid_type}")
+        self.grid_type = grid_type
+        self.fields = list(fields or [])
+        self.precision = precision
+
+    @property
+    def cellid_fields(self) -> list:
+        """Cell index field names."""
+        return CELLID_FIELDS[self.grid_type]
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Record dtype."""
+        real = np.float64 if self.precision == "double" else np.float32
+        return np.dtype(
+            [(name, np.int32) for name in self.cellid_fields]
+            + [
+                (name, real if np.dtype(dtype).kind == "f" else dtype)
+                for name, dtype in self.fields
+            ]
         )
-        file_array = np.fromfile(read_file, dtype=header, count=-1)
-        if not build_cellid:
-            return file_array
-        # build data list for recarray
-        cellid_size = len(self._get_cell_header(modelgrid))
-        data_list = []
-        for record in file_array:
-            data_record = ()
-            current_cellid_size = 0
-            current_cellid = ()
-            for index, data_item in enumerate(record):
-                if index in ext_cellid_indexes:
-                    current_cellid += (data_item - 1,)
-                    current_cellid_size += 1
-                    if current_cellid_size == cellid_size:
-                        data_record += current_cellid
-                        data_record = (data_record,)
-                        current_cellid = ()
-                        current_cellid_size = 0
-                else:
-                    data_record += (data_item,)
-            data_list.append(data_record)
-        return data_list
 
-    def write_binary_file(
-        self, data, fname, modelgrid=None, precision="double"
-    ):
-        fd = _open_ext_file(fname, binary=True, write=True)
-        data_array = self._build_data_array(data, modelgrid, precision)
-        data_array.tofile(fd)
-        fd.close()
+    def read(self, fname, memmap=False) -> np.ndarray:
+        """Read the list from file as a structured array."""
+        dtype = self.dtype
+        size = os.path.getsize(fname)
+        if size % dtype.itemsize:
+            raise BinaryException(
+                f"Binary file {fname} does not contain expected data. "
+                f"Size {size} is not a multiple of the record size "
+                f"{dtype.itemsize}."
+            )
+        if memmap:
+            return np.memmap(fname, dtype=dtype, mode="c")
+        return np.fromfile(fname, dtype=dtype)
 
-    def _get_cell_header(self, modelgrid):
-        if modelgrid.grid_type == "structured":
-            return [("layer", np.int32), ("row", np.int32), ("col", np.int32)]
-        elif modelgrid.grid_type == "vertex":
-            return [("layer", np.int32), ("ncpl", np.int32)]
-        else:
-            return [("nodes", np.int32)]
+    def read_columns(self, fname) -> dict:
+        """
+        Read the list from file as columns: a "cellid" array of
+        shape (nrecords, ncelldim) with zero-based cell indices,
+        and an array for each value field.
+        """
+        records = self.read(fname)
+        cellid = structured_to_unstructured(records[self.cellid_fields])
+        columns = {"cellid": cellid - 1}
+        for name, _ in self.fields:
+            columns[name] = records[name]
+        return columns
+
+    def read_binary_data_from_file(self, fname, build_cellid=True):
+        """
+        Read the list from file as a list of records, with the
+        cell indices (converted to zero-based) grouped into a
+        cellid tuple at the start of each record.
+        """
+        if not build_cellid:
+            return self.read(fname)
+        columns = self.read_columns(fname)
+        cellids = map(tuple, columns.pop("cellid").tolist())
+        return list(zip(cellids, *(c.tolist() for c in columns.values())))
 
+    def write(self, fname, data, renames=None):
+        """
+        Write the list to file. `data` is anything convertible
+        to a structured array with the list's record dtype, e.g.
+        a sequence of tuples with one-based cell indices. If a
+        `renames` list is given, the file is left to be renamed
+        into place by the caller, as by `atomic_write`.
+        """
+        with atomic_write(fname, "wb", renames) as f:
+            np.asarray(data, dtype=self.dtype).tofile(f)
 
-def _open_ext_file(fname, binary=False, write=False):
-    model_dim = self._data_dimensions.package_dim.model_dim[0]
-    read_file = self._simulation_data.mfpath.resolve_path(
-        fname, model_dim.model_name
-    )
-    if write:
-        options = "w"
-    else:
-        options = "r"
-    if binary:
-        options = f"{options}b"
-    try:
-        fd = open(read_file, options)
-        return fd
-    except:
-        message = (
-            "Unable to open file {} in mode {}.  Make sure the "
-            "file is not locked and the folder exists"
-            ".".format(read_file, options)
-        )
-        type_, value_, traceback_ = sys.exc_info()
-        raise BinaryException(
-            self._data_dimensions.structure.get_model(),
-            self._data_dimensions.structure.get_package(),
-            self._data_dimensions.structure.path,
-            "opening external file for writing",
-            self._data_dimensions.structure.name,
-            inspect.stack()[0][3],
-            type_,
-            value_,
-            traceback_,
-            message,
-            self._simulation_data.debug,
+    def write_columns(self, fname, columns, renames=None):
+        """
+        Write the list to file from columns, as returned by
+        `read_columns`, i.e. with zero-based cell indices. If
+        a `renames` list is given, the file is left to be
+        renamed into place by the caller, as by `atomic_write`.
+        """
+        cellid = np.asarray(columns["cellid"]).reshape(
+            -1, len(self.cellid_fields)
         )
+        records = np.empty(len(cellid), dtype=self.dtype)
+        for i, name in enumerate(self.cellid_fields):
+            records[name] = cellid[:, i] + 1
+        for name, _ in self.fields:
+            records[name] = columns[name]
+        with atomic_write(fname, "wb", renames) as f:
+            records.tofile(f)
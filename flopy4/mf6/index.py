@@ -0,0 +1,172 @@
+import json
+import os
+import re
+from collections.abc import Mapping
+from io import TextIOWrapper
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, TextIO, Tuple
+
+from flopy4.io.tokens import read_chunks
+
+BLOCK_LINE = re.compile(
+    rb"^[ \t]*(begin|end)[ \t]+([a-z0-9_-]+)(?:[ \t]+([0-9]+))?[^\n]*\n?",
+    re.IGNORECASE | re.MULTILINE,
+)
+"""Matches a block's `BEGIN` or `END` line, including the newline."""
+
+
+class BlockSpan(NamedTuple):
+    """
+    Byte offsets of a block in an input file: of the start of its
+    `BEGIN` line, and of the end of its `END` line.
+    """
+
+    start: int
+    end: int
+
+
+BlockKey = Tuple[str, Optional[int]]
+
+
+class BlockIndex(Mapping):
+    """
+    Index of the blocks in a MODFLOW 6 input file, mapping (name,
+    index) pairs to `BlockSpan`s. Names are lowercase, and index
+    is None for blocks without one, e.g. `("options", None)` or
+    `("period", 1000)`. Blocks are in file order.
+
+    Build an index with `scan`, or with `load`, which can cache
+    it in a sidecar file next to the input file.
+    """
+
+    def __init__(self, blocks: Optional[Dict[BlockKey, BlockSpan]] = None):
+        self._blocks = dict(blocks or {})
+
+    def __getitem__(self, key: BlockKey) -> BlockSpan:
+        return self._blocks[key]
+
+    def __iter__(self):
+        return iter(self._blocks)
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def __repr__(self):
+        return f"BlockIndex({self._blocks!r})"
+
+    def indices(self, name: str) -> list:
+        """Get the indices of all blocks with the given name."""
+        return [i for n, i in self._blocks if n == name]
+
+    def open(self, path, key: BlockKey) -> TextIO:
+        """
+        Open the input file for reading as text from the start
+        of the given block. Text files may only seek to offsets
+        from `tell()`, so the file is opened in binary mode and
+        positioned at the block's byte offset before decoding.
+        """
+        f = open(path, "rb")
+        f.seek(self[key].start)
+        return TextIOWrapper(f)
+
+    def read(self, src, key: BlockKey) -> str:
+        """
+        Read the given block's text from an input file opened
+        in binary mode. Newlines are translated to "\\n", as
+        in text mode, so they're written back in the platform's
+        own style rather than doubled.
+        """
+        span = self[key]
+        src.seek(span.start)
+        text = src.read(span.end - span.start).decode()
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    @classmethod
+    def scan(cls, path) -> "BlockIndex":
+        """
+        Scan an input file for block `BEGIN`/`END` lines in one
+        pass. The file is read in chunks, cleaned of comments by
+        the tokenizer, and searched with a regular expression,
+        so block contents are not parsed.
+        """
+        blocks = dict()
+        begin = None
+        with open(path, "rb") as f:
+            for offset, chunk in read_chunks(f):
+                for match in BLOCK_LINE.finditer(chunk):
+                    key, name, index = match.groups()
+                    name = name.decode().lower()
+                    index = int(index) if index else None
+                    if key.lower() == b"begin":
+                        if begin is not None:
+                            raise ValueError(
+                                f"Block {begin[0]} not closed before "
+                                f"block {name} in {path}"
+                            )
+                        begin = (name, index, offset + match.start())
+                        continue
+                    if begin is None or begin[0] != name:
+                        raise ValueError(f"Unexpected END {name} in {path}")
+                    key = begin[:2]
+                    if key not in blocks:
+                        blocks[key] = BlockSpan(begin[2], offset + match.end())
+                    begin = None
+        if begin is not None:
+            raise ValueError(f"Block {begin[0]} not closed in {path}")
+        return cls(blocks)
+
+    @staticmethod
+    def sidecar(path) -> Path:
+        """Return the path of the index cache file for the given file."""
+        path = Path(path)
+        return path.with_name(f"{path.name}.blocks.json")
+
+    def save(self, path):
+        """
+        Cache the index for the given input file. The cache is
+        stamped with the file's size and modification time, so
+        it's ignored if the file changes.
+        """
+        stat = os.stat(path)
+        cache = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "blocks": [
+                [name, index, span.start, span.end]
+                for (name, index), span in self._blocks.items()
+            ],
+        }
+        with open(BlockIndex.sidecar(path), "w") as f:
+            json.dump(cache, f)
+
+    @classmethod
+    def load(cls, path, cache: bool = False) -> "BlockIndex":
+        """
+        Get the index for the given input file. If `cache` is
+        true, the index is read from the sidecar file if it is
+        up to date, and otherwise is scanned and then cached.
+        """
+        if not cache:
+            return cls.scan(path)
+
+        sidecar = BlockIndex.sidecar(path)
+        stat = os.stat(path)
+        try:
+            with open(sidecar) as f:
+                cached = json.load(f)
+            if (
+                cached["size"] == stat.st_size
+                and cached["mtime_ns"] == stat.st_mtime_ns
+            ):
+                return cls(
+                    {
+                        (name, index): BlockSpan(start, end)
+                        for name, index, start, end in cached["blocks"]
+                    }
+                )
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = cls.scan(path)
+        index.save(path)
+        return index
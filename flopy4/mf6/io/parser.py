@@ -1,5 +1,7 @@
-from os import linesep
-from typing import Iterable
+from hashlib import sha256
+from os import PathLike, linesep
+from pathlib import Path
+from typing import Iterable, Optional, Union
 
 from lark import Lark
 
@@ -58,9 +60,10 @@ INOUT: "filein"i|"fileout"i
 array: constantarray | internalarray | externalarray
 constantarray: "CONSTANT" float
 internalarray: "INTERNAL" [factor] [iprn] (float* [_NL])*
-externalarray: "OPEN/CLOSE" PATH [factor] ["binary"] [iprn]
+externalarray: "OPEN/CLOSE" PATH [factor] [BINARY] [iprn]
 factor: "FACTOR" NUMBER
 iprn: "IPRN" INT
+BINARY: "(binary)"i
 
 // newline
 _NL: /(\r?\n[\t ]*)+/
@@ -79,16 +82,142 @@ _NL: /(\r?\n[\t ]*)+/
 EBNF description for the MODFLOW 6 input language.
 """
 
+MF6_LALR_GRAMMAR = r"""
+// component
+component: _NL? (block _NL)+
+
+// block
+block: _dictblock | _listblock
+_dictblock: _BEGIN dictblock _NL dict _END dictblock
+_listblock: _BEGIN listblock _NL list _END listblock
+dictblock: DICTBLOCK
+listblock: LISTBLOCK [_blockindex]
+_blockindex: INT
+_BEGIN: "begin"i
+_END: "end"i
+
+// dict
+dict: (param _NL)*
+
+// list, with the records lexed as a single token. a record is
+// any line not starting with "end", blank and comment lines are
+// swallowed along with the newline.
+list: LISTDATA?
+LISTDATA: /(?:(?!(?i:end)\b)(?=\S)[^\r\n]*(?:\r?\n[ \t]*(?:#[^\n]*)?)+)+/
+
+// parameter
+param: key | _pair
+_pair: key value
+key: PARAM
+?value: array
+      | path
+      | string
+      | int
+      | float
+
+// string
+word: WORD
+?string: word+
+
+// number
+int: INT
+float: FLOAT
+
+// file path
+path: INOUT PATH
+PATH: /[^\s#]+/
+INOUT.2: "filein"i|"fileout"i
+
+// array, with the values lexed as a single token. the control
+// line may follow the parameter name on the same or next line.
+array: constantarray | internalarray | externalarray
+constantarray: _CONSTANT NUMBER
+internalarray: _INTERNAL [factor] [iprn] ARRAYDATA
+externalarray: _OPENCLOSE PATH [factor] [BINARY] [iprn]
+_CONSTANT.2: /(\r?\n[ \t]*)?constant/i
+_INTERNAL.2: /(\r?\n[ \t]*)?internal/i
+_OPENCLOSE.2: /(\r?\n[ \t]*)?open\/close/i
+factor: "FACTOR"i NUMBER
+iprn: "IPRN"i INT
+BINARY: "(binary)"i
+_ARRAYSEP: /(?:[ \t]+|(?:[ \t]*\r?\n[ \t]*)+)/
+_ARRAYCOUNT: /(?:[0-9]+\*)?/
+_ARRAYREAL: /[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eEdD][+-]?[0-9]+)?/
+_ARRAYNUM: _ARRAYCOUNT _ARRAYREAL
+ARRAYDATA: /(?:[ \t]*\r?\n[ \t]*)*/ _ARRAYNUM (_ARRAYSEP _ARRAYNUM)*
+
+// newline, including any blank or comment lines after it, so
+// there's only ever one newline token between statements
+_NL: /(\r?\n[\t ]*(#[^\n]*)?)+/
+
+%import common.SH_COMMENT -> COMMENT
+%import common.SIGNED_NUMBER -> NUMBER
+%import common.SIGNED_INT -> INT
+%import common.SIGNED_FLOAT -> FLOAT
+%import common.WORD
+%import common.WS_INLINE
+
+%ignore COMMENT
+%ignore WS_INLINE
+"""
+"""
+EBNF description for the MODFLOW 6 input language, for the LALR
+parser. The grammar is unambiguous given one token of lookahead,
+and internal array values and list records are lexed as single
+`ARRAYDATA` and `LISTDATA` tokens, to be parsed in bulk rather than
+as a tree node per value.
+"""
+
+
+_PARSERS = dict()
+"""Parsers by specification, grammar compilation is expensive."""
+
+
+def make_grammar(
+    params: Iterable[str],
+    dict_blocks: Iterable[str],
+    list_blocks: Iterable[str],
+    parser: str = "earley",
+) -> str:
+    """
+    Create a grammar for the MODFLOW 6 input language with the given
+    parameter and block specification, for the given Lark parser.
+    """
+    params = "|".join(['"' + n + '"i' for n in params])
+    dict_blocks = "|".join(['"' + n + '"i' for n in dict_blocks])
+    list_blocks = "|".join(['"' + n + '"i' for n in list_blocks])
+    return linesep.join(
+        [
+            MF6_LALR_GRAMMAR if parser == "lalr" else MF6_GRAMMAR,
+            f"PARAM: ({params})",
+            f"DICTBLOCK: ({dict_blocks})",
+            f"LISTBLOCK: ({list_blocks})",
+        ]
+    )
+
 
 def make_parser(
     params: Iterable[str],
     dict_blocks: Iterable[str],
     list_blocks: Iterable[str],
+    parser: str = "earley",
+    cache: Optional[Union[bool, str, PathLike]] = None,
 ):
     """
     Create a parser for the MODFLOW 6 input language with the given
     parameter and block specification.
 
+    `parser` selects the Lark parsing algorithm: "earley" (default)
+    or "lalr". The latter uses a contextual lexer and runs in linear
+    time, and lexes each internal array's values as a single token,
+    so it is suitable for large input files. Parsers are cached
+    in memory by specification and `cache`, so repeated calls with
+    the same arguments return the same parser. For LALR parsers, if
+    `cache` is a directory, or `True` (for Lark's default temporary
+    directory), the compiled parse tables are also cached on disk,
+    keyed by the grammar's hash, so new processes can skip grammar
+    compilation. Lark does not support caching Earley parsers.
+
     Notes
     -----
     We specify blocks containing parameters separately from blocks
@@ -98,15 +227,24 @@ def make_parser(
     of named parameters to parse as a block with a list of records.
 
     """
-    params = "|".join(['"' + n + '"i' for n in params])
-    dict_blocks = "|".join(['"' + n + '"i' for n in dict_blocks])
-    list_blocks = "|".join(['"' + n + '"i' for n in list_blocks])
-    grammar = linesep.join(
-        [
-            MF6_GRAMMAR,
-            f"PARAM: ({params})",
-            f"DICTBLOCK: ({dict_blocks})",
-            f"LISTBLOCK: ({list_blocks})",
-        ]
-    )
-    return Lark(grammar, start="component")
+    params = tuple(params)
+    dict_blocks = tuple(dict_blocks)
+    list_blocks = tuple(list_blocks)
+    if cache and cache is not True:
+        cache = Path(cache).expanduser()
+    key = (params, dict_blocks, list_blocks, parser, cache or None)
+    cached = _PARSERS.get(key, None)
+    if cached is not None:
+        return cached
+
+    grammar = make_grammar(params, dict_blocks, list_blocks, parser)
+    options = dict(start="component", parser=parser)
+    if cache and parser == "lalr":
+        if cache is True:
+            options["cache"] = True
+        else:
+            digest = sha256(grammar.encode()).hexdigest()
+            cache.mkdir(parents=True, exist_ok=True)
+            options["cache"] = str(cache / f"mf6-{digest}.lark")
+    _PARSERS[key] = Lark(grammar, **options)
+    return _PARSERS[key]
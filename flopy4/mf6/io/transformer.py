@@ -1,10 +1,11 @@
+from io import StringIO
 from pathlib import Path
 
 import numpy as np
-from lark import Transformer
+from lark import Token, Transformer
 
+from flopy4.array import ConstantArray, MFArray, MFArrayType
 from flopy4.io.lark import (
-    parse_array,
     parse_float,
     parse_int,
     parse_string,
@@ -12,6 +13,50 @@ from flopy4.io.lark import (
 )
 
 
+def _parse_value(value: str):
+    """Parse an int, float or string, in that order of precedence."""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value.upper().replace("D", "E"))
+    except ValueError:
+        return value
+
+
+def _parse_column(column: np.ndarray) -> list:
+    """
+    Parse a string column in one call if it's homogeneous, as
+    ints or else floats, otherwise value by value.
+    """
+    try:
+        return column.astype(np.int64).tolist()
+    except ValueError:
+        pass
+    try:
+        upper = np.char.upper(column)
+        return np.char.replace(upper, "D", "E").astype(np.float64).tolist()
+    except ValueError:
+        return [_parse_value(v) for v in column.tolist()]
+
+
+def parse_records(text: str) -> list:
+    """
+    Parse a span of list input into a list of record tuples.
+    If all records have the same length, they are parsed by
+    column rather than by value.
+    """
+    rows = [line.split("#", 1)[0].split() for line in text.splitlines()]
+    rows = [row for row in rows if row]
+    if not rows:
+        return []
+    if len({len(row) for row in rows}) > 1:
+        return [tuple(_parse_value(v) for v in row) for row in rows]
+    columns = np.array(rows, dtype=str).T
+    return list(zip(*(_parse_column(c) for c in columns)))
+
+
 class MF6Transformer(Transformer):
     """
     Transforms a parse tree for the MODFLOW 6 input language
@@ -27,28 +72,65 @@ class MF6Transformer(Transformer):
 
     See https://lark-parser.readthedocs.io/en/stable/visitors.html#transformer
     for more info.
+
+    Constant arrays are given the shape of the same name in
+    `shapes`, if any, since the grammar doesn't know shapes.
     """
 
+    def __init__(self, shapes=None, **kwargs):
+        super().__init__(**kwargs)
+        self.shapes = shapes or {}
+
     def key(self, k):
         (k,) = k
         return str(k).lower()
 
+    def array(self, a):
+        # internal arrays are already parsed, and constant and
+        # external arrays are left lazy rather than densified
+        (a,) = a
+        return a
+
     def constantarray(self, a):
-        # TODO factor out `ConstantArray`
-        # array-like class from `MFArray`
-        # with deferred shape and use it
-        pass
+        (value,) = a
+        return ConstantArray(float(value))
 
     def internalarray(self, a):
         factor = a[0]
-        array = np.array(a[2:])
+        if len(a) == 3 and isinstance(a[2], Token):
+            # values lexed as one span (LALR), parse them in bulk
+            array = MFArray.read_array(StringIO(str(a[2])))
+        else:
+            array = np.array(a[2:])
         if factor is not None:
             array *= factor
         return array
 
+    def factor(self, f):
+        (f,) = f
+        return float(f)
+
+    def iprn(self, i):
+        (i,) = i
+        return int(i)
+
     def externalarray(self, a):
-        # TODO
-        pass
+        # the file isn't read until the array is accessed,
+        # and the shape is taken from the file if need be
+        path, factor, binary, _ = a
+        return MFArray(
+            shape=None,
+            how=MFArrayType.external,
+            factor=factor,
+            path=Path(path),
+            binary=binary is not None,
+        )
+
+    def list(self, l):
+        if len(l) == 1 and isinstance(l[0], Token):
+            # records lexed as one span (LALR), parse them in bulk
+            return parse_records(str(l[0]))
+        return l
 
     def path(self, p):
         _, p = p
@@ -57,6 +139,8 @@ class MF6Transformer(Transformer):
     def param(self, p):
         k = p[0]
         v = True if len(p) == 1 else p[1]
+        if isinstance(v, ConstantArray) and v.shape is None:
+            v.shape = self.shapes.get(k)
         return k, v
 
     def block(self, b):
@@ -76,9 +160,7 @@ class MF6Transformer(Transformer):
     string = parse_string
     int = parse_int
     float = parse_float
-    array = parse_array
     record = tuple
-    list = list
     dict = dict
     params = dict
     component = dict
@@ -1,11 +1,171 @@
+import os
 from abc import ABCMeta
+from collections import UserDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import StringIO
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from flopy4.array import MFArray
 from flopy4.block import MFBlock
+from flopy4.io.tokens import strip
 from flopy4.ispec.gwf_nam import GwfNam
 from flopy4.package import MFPackage, MFPackages
-from flopy4.utils import strip
+from flopy4.resolver import Resolve, invalidate
+from flopy4.utils import (
+    checksum_path,
+    digest,
+    read_checksum,
+    temp_path,
+)
+
+DIS_FTYPES = ("dis6", "disv6", "disu6")
+"""Discretization package types, which determine the model shape."""
+
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+"""Executors for parallel loading, by name."""
+
+
+def get_model_shape(ftype: str, package: MFPackage):
+    """Get the model shape from the given discretization package."""
+    if ftype == "dis6":
+        nlay = package.params["nlay"]
+        nrow = package.params["nrow"]
+        ncol = package.params["ncol"]
+        return (nlay, nrow, ncol)
+    elif ftype == "disv6":
+        nlay = package.params["nlay"]
+        ncpl = package.params["ncpl"]
+        return (nlay, ncpl)
+    elif ftype == "disu6":
+        return package.params["nodes"]
+    return None
+
+
+def load_package(cls, fname, **kwargs) -> MFPackage:
+    """
+    Load a package of the given class from the given file. This is
+    a module-level function so it can be sent to a process pool.
+    """
+    with open(fname, "r") as f:
+        return cls.load(f, **kwargs)
+
+
+def array_binaries(component) -> list:
+    """
+    Get the set of external binary files last written by each
+    of the component's arrays, in a fixed order, so that the
+    sets can be merged between copies of the component.
+    """
+    if not isinstance(component, MFPackage):
+        return []
+    return [
+        param._binaries
+        for block in component.values()
+        if block is not None
+        for param in block.values()
+        if isinstance(param, MFArray)
+    ]
+
+
+def write_component(component, fpath, checksum=False, **kwargs):
+    """
+    Write a component to a temporary file alongside the given
+    path, and return (temporary path, path) pairs to rename,
+    and the component's `array_binaries`. External binary
+    files the component writes are included in the former,
+    so they're renamed into place along with the component.
+
+    If `checksum` is true, a checksum file is written too, and
+    nothing is written if the content matches the checksum file,
+    so unchanged files can be skipped even by a fresh process.
+    Otherwise any existing checksum file is rewritten with the
+    file, rather than left stale.
+    """
+    sidecar = checksum_path(fpath)
+    renames = []
+    kwargs["renames"] = renames
+    try:
+        if checksum or sidecar.exists():
+            buffer = StringIO()
+            component.write(buffer, checksum=checksum, **kwargs)
+            text = buffer.getvalue()
+            hexdigest = digest(text.encode())
+            if not checksum or read_checksum(fpath) != hexdigest:
+                for target, content in [(fpath, text), (sidecar, hexdigest)]:
+                    tmp = temp_path(target)
+                    renames.append((tmp, target))
+                    tmp.write_text(content)
+        else:
+            tmp = temp_path(fpath)
+            renames.append((tmp, fpath))
+            with open(tmp, "w") as f:
+                component.write(f, **kwargs)
+    except BaseException:
+        for tmp, _ in renames:
+            tmp.unlink(missing_ok=True)
+        raise
+    return renames, array_binaries(component)
+
+
+def write_components(tasks, executor=None, force=False):
+    """
+    Write components from (component, path, kwargs) tasks, at
+    once if an executor is given. Each file is written to a
+    temporary file, and only once all have been written are
+    they renamed into place. If any write fails, all of the
+    temporary files are removed and the error is re-raised,
+    leaving the original files as they were.
+
+    Packages which haven't been modified since they were last
+    written to the same path with the same options are skipped,
+    unless `force` is true, and written packages are marked
+    clean. External binary files written by a package's arrays
+    in another process are recorded in the original arrays.
+    """
+    if not force:
+        tasks = [
+            (component, fpath, kwargs)
+            for component, fpath, kwargs in tasks
+            if not isinstance(component, MFPackage)
+            or component.needs_write(fpath, **kwargs)
+        ]
+    renames = []
+    binaries = []
+    error = None
+    if executor is None:
+        for component, fpath, kwargs in tasks:
+            try:
+                result = write_component(component, fpath, **kwargs)
+            except BaseException as e:
+                error = e
+                break
+            renames.extend(result[0])
+            binaries.append(result[1])
+    else:
+        futures = [
+            executor.submit(write_component, component, fpath, **kwargs)
+            for component, fpath, kwargs in tasks
+        ]
+        for future in futures:
+            try:
+                result = future.result()
+            except BaseException as e:
+                error = error or e
+                continue
+            renames.extend(result[0])
+            binaries.append(result[1])
+    if error is not None:
+        for tmp, _ in renames:
+            tmp.unlink(missing_ok=True)
+        raise error
+    for tmp, target in renames:
+        os.replace(tmp, target)
+    for (component, fpath, kwargs), written in zip(tasks, binaries):
+        for ours, theirs in zip(array_binaries(component), written):
+            ours.update(theirs)
+        if isinstance(component, MFPackage):
+            component.mark_written(fpath, **kwargs)
 
 
 class MFModelMeta(type):
@@ -57,9 +217,10 @@ class MFModel(MFPackages, metaclass=MFModelMappingMeta):
     def __getattribute__(self, name: str) -> Any:
         self_type = type(self)
 
+        # shortcut to the package value, evaluating only the
+        # requested package rather than the whole model
         if name + "6" in self_type.packages:
-            return self.value[name]
-            # return self.packages[name]
+            return self.data[name].value
 
         if name == "packages":
             return self.value
@@ -81,12 +242,18 @@ class MFModel(MFPackages, metaclass=MFModelMappingMeta):
 
     @classmethod
     def load(cls, f, **kwargs):
-        """Load the model name file."""
+        """
+        Load the model name file and the packages it lists. See
+        `load_packages` for the `parallel` and `max_workers`
+        options.
+        """
         packages = dict()
         members = cls.packages
 
         mempath = kwargs.pop("mempath", None)
         mtype = kwargs.pop("mtype", None)
+        parallel = kwargs.pop("parallel", None)
+        max_workers = kwargs.pop("max_workers", None)
         mname = strip(mempath.split("/")[-1])
         kwargs["mempath"] = f"{mempath}"
         kwargs["name"] = f"{mname}.nam"
@@ -95,7 +262,14 @@ class MFModel(MFPackages, metaclass=MFModelMappingMeta):
 
         packages["nam6"] = GwfNam.load(f, **kwargs)
 
-        MFModel.load_packages(members, packages["nam6"], packages, **kwargs)
+        MFModel.load_packages(
+            members,
+            packages["nam6"],
+            packages,
+            parallel=parallel,
+            max_workers=max_workers,
+            **kwargs,
+        )
         return cls(name=mname, mempath=mempath, mtype=mtype, packages=packages)
 
     @staticmethod
@@ -104,14 +278,28 @@ class MFModel(MFPackages, metaclass=MFModelMappingMeta):
         blocks: Dict[str, MFBlock],
         packages: Dict[str, MFPackage],
         mempath,
+        parallel: Optional[str] = None,
+        max_workers: Optional[int] = None,
         **kwargs,
     ):
-        """Load model name file packages"""
+        """
+        Load model name file packages.
+
+        The discretization package is loaded first, since it
+        determines the model shape. If `parallel` is "thread"
+        or "process", the remaining packages are then loaded
+        concurrently in a pool of that kind with `max_workers`
+        workers (by default, as many as the executor chooses).
+        Otherwise they are loaded one after another. Packages
+        are added to `packages` in name file order either way.
+        """
         if "ftype" not in blocks.params["packages"]:
             # packages block was empty
             return
+        if parallel is not None and parallel not in EXECUTORS:
+            raise ValueError(f"Unsupported parallel mode: {parallel}")
         kwargs.pop("mname", None)
-        model_shape = None
+        entries = []
         assert "packages" in blocks
         for param_name, param in blocks["packages"].items():
             if param_name != "packages":
@@ -120,35 +308,109 @@ class MFModel(MFPackages, metaclass=MFModelMappingMeta):
             assert "fname" in param.value
             assert "pname" in param.value
             for i in range(len(param.value["ftype"])):
-                ftype = param.value["ftype"][i]
+                ftype = param.value["ftype"][i].lower()
                 fname = param.value["fname"][i]
                 pname = param.value["pname"][i]
-                package = members.get(ftype.lower(), None)
-                with open(fname, "r") as f:
-                    kwargs["model_shape"] = model_shape
-                    kwargs["mempath"] = f"{mempath}/{pname}"
-                    kwargs["ftype"] = ftype.lower()
-                    packages[pname] = type(package).load(f, **kwargs)
-                    if ftype.lower() == "dis6":
-                        nlay = packages[pname].params["nlay"]
-                        nrow = packages[pname].params["nrow"]
-                        ncol = packages[pname].params["ncol"]
-                        model_shape = (nlay, nrow, ncol)
-                    elif ftype.lower() == "disv6":
-                        nlay = packages[pname].params["nlay"]
-                        ncpl = packages[pname].params["ncpl"]
-                        model_shape = (nlay, ncpl)
-                    elif ftype.lower() == "disu6":
-                        nodes = packages[pname].params["nodes"]
-                        model_shape = nodes
+                package = members.get(ftype, None)
+                entries.append((ftype, fname, pname, type(package)))
 
-    def write(self, basepath, **kwargs):
-        """Write the model to files."""
+        def package_kwargs(ftype, pname):
+            return {
+                **kwargs,
+                "model_shape": model_shape,
+                "mempath": f"{mempath}/{pname}",
+                "ftype": ftype,
+            }
+
+        order = [pname for _, _, pname, _ in entries]
+        loaded = dict()
+        model_shape = None
+        for ftype, fname, pname, cls in entries:
+            if ftype not in DIS_FTYPES:
+                continue
+            loaded[pname] = load_package(
+                cls, fname, **package_kwargs(ftype, pname)
+            )
+            model_shape = get_model_shape(ftype, loaded[pname])
+
+        entries = [e for e in entries if e[2] not in loaded]
+        if parallel is None:
+            for ftype, fname, pname, cls in entries:
+                loaded[pname] = load_package(
+                    cls, fname, **package_kwargs(ftype, pname)
+                )
+        else:
+            with EXECUTORS[parallel](max_workers=max_workers) as executor:
+                futures = {
+                    pname: executor.submit(
+                        load_package,
+                        cls,
+                        fname,
+                        **package_kwargs(ftype, pname),
+                    )
+                    for ftype, fname, pname, cls in entries
+                }
+                for pname, future in futures.items():
+                    loaded[pname] = future.result()
+
+        for pname in order:
+            packages[pname] = loaded[pname]
+
+    def write_tasks(self, basepath, **kwargs):
+        """
+        Get a (package, path, kwargs) task to write each of the
+        model's package files, for `write_components`.
+        """
         path = Path(basepath)
-        for p in self._p:
-            if self._p[p].name.endswith(".nam"):
-                with open(path / self._p[p].name, "w") as f:
-                    self._p[p].write(f)
-            else:
-                with open(path / self._p[p].name, "w") as f:
-                    self._p[p].write(f)
+        kwargs["basepath"] = path
+        return [(p, path / p.name, kwargs) for p in self._p.values()]
+
+    def write(self, basepath, **kwargs):
+        """
+        Write the model to files.
+
+        If `parallel` is "thread" or "process", package files
+        (and any external array files) are written concurrently
+        in a pool of that kind with `max_workers` workers. The
+        files are written atomically: no file is replaced until
+        all have been written in full.
+
+        Only packages modified since they were last written to
+        the same path are written, unless `force` is true. If
+        `checksum` is true, checksum files are kept alongside
+        package and external binary files, and files whose
+        content is unchanged are skipped.
+        """
+        parallel = kwargs.pop("parallel", None)
+        max_workers = kwargs.pop("max_workers", None)
+        force = kwargs.get("force", False)
+        tasks = self.write_tasks(basepath, **kwargs)
+        if parallel is None:
+            write_components(tasks, force=force)
+            return
+        if parallel not in EXECUTORS:
+            raise ValueError(f"Unsupported parallel mode: {parallel}")
+        with EXECUTORS[parallel](max_workers=max_workers) as executor:
+            write_components(tasks, executor, force)
+
+
+class MFModels(UserDict):
+    """
+    Mapping of model names to a simulation's models. Models
+    added are given the simulation's `resolver`, for memory
+    path lookups, and the lookup index is invalidated.
+    """
+
+    def __init__(self, models=None, resolver=None):
+        self.resolver = resolver
+        super().__init__(models)
+
+    def __setitem__(self, key, model):
+        invalidate()
+        if isinstance(model, Resolve):
+            model.resolver = self.resolver
+        super().__setitem__(key, model)
+
+    def __delitem__(self, key):
+        invalidate()
+        super().__delitem__(key)
@@ -1,15 +1,23 @@
 from abc import ABCMeta
 from collections import OrderedDict, UserDict
+from collections.abc import Mapping
 from io import StringIO
 from itertools import groupby
 from keyword import kwlist
+from pathlib import Path
 from pprint import pformat
 from typing import Any, Dict, Optional
 from warnings import warn
 
+from flopy4.array import CacheInfo
 from flopy4.block import MFBlock, MFBlockMeta, MFBlocks, collect_params
+from flopy4.io.tokens import TokenReader, strip
+from flopy4.mf6.index import BlockIndex
 from flopy4.param import MFParam, MFParams
-from flopy4.utils import strip
+from flopy4.resolver import invalidate
+
+WRITE_OPTIONS = ("binary_threshold", "digits", "width", "columns")
+"""Write keyword arguments which change the written files."""
 
 
 def collect_blocks(
@@ -97,7 +105,14 @@ class MFPackageMeta(type):
             else:
                 attrs[name] = block
 
-        return super().__new__(cls, clsname, bases, attrs)
+        package_cls = super().__new__(cls, clsname, bases, attrs)
+
+        # block classes are created dynamically, so they can't be
+        # pickled by name. remember where to find them instead.
+        for name, block in blocks.items():
+            type(block)._package = (package_cls, name)
+
+        return package_cls
 
 
 class MFPackageMappingMeta(MFPackageMeta, ABCMeta):
@@ -128,6 +143,7 @@ class MFPackage(MFBlocks, metaclass=MFPackageMappingMeta):
     ):
         self.name = name
         self.mempath = mempath
+        self._written = None
         super().__init__(blocks=blocks)
 
     def __getattribute__(self, name: str) -> Any:
@@ -143,7 +159,7 @@ class MFPackage(MFBlocks, metaclass=MFPackageMappingMeta):
         # and dictionary access on the instance returns the
         # full `MFParam` instance.
         if name in self_type.params:
-            return self._get_param_values()[name]
+            return self._get_param(name).value
 
         # add .blocks attribute as an alias for .value, this
         # overrides the class attribute with the block spec.
@@ -166,12 +182,40 @@ class MFPackage(MFBlocks, metaclass=MFPackageMappingMeta):
             raise TypeError(f"Expected MFPackage, got {type(other)}")
         return super().__eq__(other)
 
+    def __setitem__(self, key, block):
+        self.__dict__.pop("_index", None)
+        super().__setitem__(key, block)
+
+    def __delitem__(self, key):
+        self.__dict__.pop("_index", None)
+        super().__delitem__(key)
+
+    def _get_index(self) -> Dict[str, MFBlock]:
+        """
+        Get an index of parameter names to the blocks containing
+        them. This is cached until the package's blocks change.
+        Blocks, not parameters, are indexed because a block's
+        parameters may be replaced (e.g. by setting its value).
+        """
+        index = self.__dict__.get("_index", None)
+        if index is None:
+            index = {
+                param_name: block
+                for block in self.values()
+                for param_name in block.keys()
+            }
+            self._index = index
+        return index
+
+    def _get_param(self, name: str) -> MFParam:
+        """Get the member parameter with the given name."""
+        return self._get_index()[name][name]
+
     def _get_params(self) -> Dict[str, MFParam]:
         """Get a flattened dictionary of member parameters."""
         return {
-            param_name: param
-            for block in self.values()
-            for param_name, param in block.items()
+            param_name: block[param_name]
+            for param_name, block in self._get_index().items()
         }
 
     def _get_param_values(self) -> Dict[str, Any]:
@@ -205,6 +249,79 @@ class MFPackage(MFBlocks, metaclass=MFPackageMappingMeta):
         # coerce the block mapping to the spec and set defaults
         blocks = type(self).coerce(value.copy(), set_default=True)
         MFBlocks.value.fset(self, blocks)
+        self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Whether the package, or any of its blocks, has been
+        modified since it was created or last written.
+        """
+        periods = self.__dict__.get("_periods", None)
+        return (
+            self.__dict__.get("_dirty", False)
+            or any(b.dirty for b in self.values() if b is not None)
+            or (periods is not None and periods.dirty)
+        )
+
+    @dirty.setter
+    def dirty(self, value: bool):
+        self._dirty = value
+        if not value:
+            for block in self.values():
+                if block is not None:
+                    block.dirty = False
+            periods = self.__dict__.get("_periods", None)
+            if periods is not None:
+                periods.dirty = False
+
+    @property
+    def periods(self) -> Mapping[int, MFBlock]:
+        """
+        Get a mapping of stress period numbers to period blocks.
+        If the package was loaded with `load_lazy`, blocks are
+        loaded on first access.
+        """
+        periods = self.__dict__.get("_periods", None)
+        if periods is not None:
+            return periods
+        period = self.get("period", None)
+        if period is None or period.index is None:
+            return dict()
+        return {period.index: period}
+
+    def needs_write(self, path, **kwargs) -> bool:
+        """
+        Whether the package must be written to the given path
+        with the given write options, i.e. it has been modified
+        since it was last written there, or it was last written
+        elsewhere or with other options, or the file no longer
+        exists.
+        """
+        return (
+            self.dirty
+            or self._written != MFPackage._write_key(path, kwargs)
+            or not Path(path).exists()
+        )
+
+    def mark_written(self, path, **kwargs):
+        """
+        Mark the package clean, as written to the given path
+        with the given write options.
+        """
+        self.dirty = False
+        self._written = MFPackage._write_key(path, kwargs)
+        periods = self.__dict__.get("_periods", None)
+        if periods is not None:
+            periods.reindex(path)
+
+    @staticmethod
+    def _write_key(path, kwargs) -> tuple:
+        """
+        Identify a write of the package by the path and the
+        options which change the written files.
+        """
+        return (Path(path),) + tuple(kwargs.get(k) for k in WRITE_OPTIONS)
 
     @classmethod
     def coerce(
@@ -245,34 +362,252 @@ class MFPackage(MFBlocks, metaclass=MFPackageMappingMeta):
         ptype = ftype.replace("6", "")
         kwargs.pop("modeltype", None)
 
-        while True:
-            pos = f.tell()
-            line = f.readline()
-            if line == "":
-                break
-            if line == "\n":
-                continue
-            line = strip(line).lower()
-            words = line.split()
-            key = words[0]
-            if key == "begin":
-                name = words[1]
-                block = members.get(name, None)
-                if block is None:
+        with TokenReader.wrap(f) as f:
+            while True:
+                pos = f.tell()
+                line = f.readline()
+                if line == "":
+                    break
+                words = line.lower().split()
+                if not words:
                     continue
-                f.seek(pos)
-                kwargs["blk_params"] = params
-                # TODO: pname if multi-instance
-                kwargs["mempath"] = f"{mempath}/{ptype}"
-                blocks[name] = type(block).load(f, **kwargs)
-                if name == "options" or name == "dimensions":
-                    params[name] = blocks[name].params
+                key = words[0]
+                if key == "begin":
+                    name = words[1]
+                    block = members.get(name, None)
+                    if block is None:
+                        continue
+                    f.seek(pos)
+                    kwargs["blk_params"] = params
+                    # TODO: pname if multi-instance
+                    kwargs["mempath"] = f"{mempath}/{ptype}"
+                    blocks[name] = type(block).load(f, **kwargs)
+                    if name == "options" or name == "dimensions":
+                        params[name] = blocks[name].params
 
         return cls(blocks=blocks, name=pname, mempath=mempath)
 
+    @classmethod
+    def _load_kwargs(cls, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get block load keyword arguments from package load keyword
+        arguments, as in `load`. The parameters of the options and
+        dimensions blocks are to be added to `blk_params` as they
+        are loaded, since later blocks may depend on them.
+        """
+        kwargs = kwargs.copy()
+        mempath = kwargs.pop("mempath", None)
+        ftype = kwargs.pop("ftype", None)
+        ptype = ftype.replace("6", "")
+        kwargs.pop("modeltype", None)
+        kwargs["mempath"] = f"{mempath}/{ptype}"
+        kwargs["blk_params"] = {}
+        return kwargs
+
+    @classmethod
+    def load_block(
+        cls,
+        path,
+        name: str,
+        index: Optional[int] = None,
+        cache: bool = False,
+        **kwargs,
+    ) -> MFBlock:
+        """
+        Load a single block from the package file at the given
+        path, seeking straight to it via the file's `BlockIndex`
+        rather than parsing the blocks before it. If `cache` is
+        true, the index is cached alongside the file.
+
+        The options and dimensions blocks are loaded first, if
+        the file has them, since later blocks may depend on them.
+        Other keyword arguments are as for `load`.
+        """
+        name = name.lower()
+        block = cls.blocks.get(name, None)
+        if block is None:
+            raise ValueError(f"Invalid block: {name}")
+        blocks = BlockIndex.load(path, cache=cache)
+        if (name, index) not in blocks:
+            raise KeyError(f"Block not found: {name} {index or ''}".strip())
+
+        kwargs = cls._load_kwargs(kwargs)
+        params = kwargs["blk_params"]
+        for dep in ("options", "dimensions"):
+            if (
+                dep == name
+                or dep not in cls.blocks
+                or (dep, None) not in blocks
+            ):
+                continue
+            with blocks.open(path, (dep, None)) as f:
+                dep_block = type(cls.blocks[dep]).load(f, **kwargs)
+            params[dep] = dep_block.params
+        with blocks.open(path, (name, index)) as f:
+            return type(block).load(f, **kwargs)
+
+    @classmethod
+    def load_lazy(
+        cls,
+        path,
+        maxsize: Optional[int] = 128,
+        cache: bool = False,
+        **kwargs,
+    ) -> "MFPackage":
+        """
+        Load the package from the file at the given path, except
+        for its period blocks, which are loaded on first access
+        via `periods`. At most `maxsize` parsed period blocks are
+        kept in memory, or all of them if `maxsize` is None. If
+        `cache` is true, the file's `BlockIndex` is cached too.
+
+        Other keyword arguments are as for `load`.
+        """
+        blocks = dict()
+        members = cls.blocks
+        index = BlockIndex.load(path, cache=cache)
+
+        mempath = kwargs.get("mempath", None)
+        pname = strip(mempath.split("/")[-1])
+        kwargs = cls._load_kwargs(kwargs)
+        params = kwargs["blk_params"]
+
+        for name, i in index:
+            block = members.get(name, None)
+            if block is None or i is not None:
+                continue
+            with index.open(path, (name, i)) as f:
+                blocks[name] = type(block).load(f, **kwargs)
+            if name == "options" or name == "dimensions":
+                params[name] = blocks[name].params
+
+        package = cls(blocks=blocks, name=pname, mempath=mempath)
+        package._periods = MFPeriods(
+            cls, path, index, maxsize=maxsize, cache=cache, **kwargs
+        )
+        return package
+
     def write(self, f, **kwargs):
         """Write the package to file."""
+        kwargs.setdefault("prefix", self.name)
         super().write(f, **kwargs)
+        periods = self.__dict__.get("_periods", None)
+        if periods is not None:
+            periods.write(f, **kwargs)
+
+
+class MFPeriods(Mapping):
+    """
+    Mapping of stress period numbers to a package's period
+    blocks, which are loaded from the package file on first
+    access. Block offsets are found with a `BlockIndex`, so
+    a block is loaded without parsing the blocks before it.
+
+    Loaded blocks are kept in a least-recently-used cache of
+    at most `maxsize` blocks, or unbounded if `maxsize` is
+    None. Modified blocks are never evicted, so they aren't
+    lost; unmodified blocks are written by copying them from
+    the package file rather than loading them.
+    """
+
+    def __init__(
+        self,
+        package,
+        path,
+        index: BlockIndex,
+        maxsize: Optional[int] = 128,
+        cache: bool = False,
+        **kwargs,
+    ):
+        self._package = package
+        self._path = Path(path)
+        self._index = index
+        self._maxsize = maxsize
+        self._cache = cache
+        self._kwargs = kwargs
+        self._blocks = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __getitem__(self, kper: int) -> MFBlock:
+        block = self._blocks.get(kper, None)
+        if block is not None:
+            self._hits += 1
+            self._blocks.move_to_end(kper)
+            return block
+
+        if ("period", kper) not in self._index:
+            raise KeyError(kper)
+        self._misses += 1
+        block_type = type(self._package.blocks["period"])
+        with self._index.open(self._path, ("period", kper)) as f:
+            block = block_type.load(f, **self._kwargs)
+        block.dirty = False
+        self._blocks[kper] = block
+        self._evict()
+        return block
+
+    def __iter__(self):
+        return iter(self._index.indices("period"))
+
+    def __len__(self):
+        return len(self._index.indices("period"))
+
+    def __repr__(self):
+        return f"MFPeriods({self._path}, loaded={list(self._blocks)})"
+
+    def _evict(self):
+        """Evict unmodified blocks until the cache fits."""
+        if self._maxsize is None:
+            return
+        excess = len(self._blocks) - self._maxsize
+        for kper in list(self._blocks):
+            if excess <= 0:
+                break
+            if not self._blocks[kper].dirty:
+                del self._blocks[kper]
+                excess -= 1
+
+    @property
+    def loaded(self) -> list:
+        """Get the numbers of the periods currently in memory."""
+        return list(self._blocks)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Return block cache statistics, like `functools.lru_cache`.
+        """
+        return CacheInfo(self._hits, self._misses)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether any loaded block has been modified."""
+        return any(b.dirty for b in self._blocks.values())
+
+    @dirty.setter
+    def dirty(self, value: bool):
+        for block in self._blocks.values():
+            block.dirty = value
+        if not value:
+            self._evict()
+
+    def reindex(self, path):
+        """
+        Read blocks from the given file from now on, e.g. once
+        the package has been written to it.
+        """
+        self._path = Path(path)
+        self._index = BlockIndex.load(path, cache=self._cache)
+
+    def write(self, f, **kwargs):
+        """Write the period blocks to file."""
+        with open(self._path, "rb") as src:
+            for kper in self:
+                block = self._blocks.get(kper, None)
+                if block is not None:
+                    block.write(f, **kwargs)
+                    continue
+                f.write(self._index.read(src, ("period", kper)))
 
 
 class MFPackages(UserDict):
@@ -290,6 +625,14 @@ class MFPackages(UserDict):
     def __repr__(self):
         return pformat(self.data)
 
+    def __setitem__(self, key, package):
+        invalidate()
+        super().__setitem__(key, package)
+
+    def __delitem__(self, key):
+        invalidate()
+        super().__delitem__(key)
+
     def __eq__(self, other):
         if not isinstance(other, MFPackages):
             raise TypeError(f"Expected MFPackages, got {type(other)}")
@@ -7,6 +7,7 @@ from pprint import pformat
 from typing import Any, Dict, Optional, Tuple
 
 from flopy4.constants import MFReader
+from flopy4.resolver import invalidate
 
 
 @dataclass
@@ -168,6 +169,18 @@ class MFParam(MFParamSpec):
         """Get the parameter's value, if loaded."""
         pass
 
+    @property
+    def dirty(self) -> bool:
+        """
+        Whether the parameter has been modified since it was
+        created or last written.
+        """
+        return self.__dict__.get("_dirty", True)
+
+    @dirty.setter
+    def dirty(self, value: bool):
+        self._dirty = value
+
     @abstractmethod
     def write(self, f, **kwargs):
         """Write the parameter to file."""
@@ -189,6 +202,14 @@ class MFParams(UserDict):
     def __repr__(self):
         return pformat(self.data)
 
+    def __setitem__(self, key, param):
+        invalidate()
+        super().__setitem__(key, param)
+
+    def __delitem__(self, key):
+        invalidate()
+        super().__delitem__(key)
+
     def __eq__(self, other):
         if not isinstance(other, MFParams):
             raise TypeError(f"Expected MFParams, got {type(other)}")
@@ -1,41 +1,85 @@
-from types import MappingProxyType
+from collections.abc import Mapping
 from typing import Any, Dict, Optional
 
+_generation = 0
+"""Count of container modifications, to tell stale indices."""
 
-class ResolveSingleton(object):
-    def __new__(
-        cls,
-        name: Optional[str] = "sim",
-        models: Optional[Dict[str, Dict]] = None,
-    ):
-        if not hasattr(cls, "instance"):
-            cls.instance = super(ResolveSingleton, cls).__new__(cls)
-            cls.instance.name = name
-            cls.instance.models = MappingProxyType(models)
-        return cls.instance
 
+def invalidate():
+    """
+    Invalidate memory path indices. Must be called whenever a
+    component is added to, or replaced in, any container.
+    """
+    global _generation
+    _generation += 1
+
+
+class Resolver:
+    """
+    Memory path index of a simulation's components, mapping
+    e.g. "sim/gwf/ic/griddata/strt" to the live parameter.
+    Components are indexed as they are found, and the index
+    is cleared once any container has been modified.
+    """
 
-class Resolve:
     def __init__(
         self,
         name: Optional[str] = "sim",
         models: Optional[Dict[str, Dict]] = None,
     ):
-        ResolveSingleton(name, models)
+        self.name = name
+        self.models = {} if models is None else models
+        self.index = dict()
+        self.generation = _generation
+
+    def lookup(self, mempath: str) -> Any:
+        """
+        Find the live component at the given memory path, or
+        None if there is none. No values are evaluated.
+        """
+        if self.generation != _generation:
+            self.index.clear()
+            self.generation = _generation
+        res = self.index.get(mempath, None)
+        if res is not None:
+            return res
 
-    def resolve(self, mempath: str) -> Any:
-        res = None
-        resolver = ResolveSingleton()
         words = mempath.split("/")
         sim_name = words.pop(0)
-        assert sim_name == resolver.name
-        cmp_name = words.pop(0)
-        if cmp_name in list(resolver.models):
-            res = resolver.models[cmp_name].value
-        # elif cmp_name in list(resolver.exchanges):
-        #    res = resolver.exchanges[cmp_name].value
-        for i in range(len(words)):
+        assert sim_name == self.name
+        res = self.models
+        for word in words:
+            if not isinstance(res, Mapping):
+                return None
+            res = res.get(word, None)
             if res is None:
-                break
-            res = res.get(words[i], None)
+                return None
+        self.index[mempath] = res
         return res
+
+
+class Resolve:
+    """
+    Memory path lookups for a model, via the `Resolver` of
+    the simulation it was added to.
+    """
+
+    resolver: Optional[Resolver] = None
+
+    def lookup(self, mempath: str) -> Any:
+        """
+        Find the live component at the given memory path, e.g.
+        "sim/gwf/ic/griddata/strt" for a parameter, or None if
+        there is none. No values are evaluated.
+        """
+        if self.resolver is None:
+            raise ValueError("Model has not been added to a simulation")
+        return self.resolver.lookup(mempath)
+
+    def resolve(self, mempath: str) -> Any:
+        """
+        Get the value of the component at the given memory path.
+        Only the requested component's value is evaluated.
+        """
+        res = self.lookup(mempath)
+        return None if res is None else res.value
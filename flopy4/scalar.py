@@ -3,8 +3,8 @@ from pathlib import Path
 from typing import Generic, Optional, TypeVar, get_args
 
 from flopy4.constants import MFFileInout
+from flopy4.io.tokens import strip
 from flopy4.param import MFParam, MFReader
-from flopy4.utils import strip
 
 PAD = "  "
 T = TypeVar("T")
@@ -73,6 +73,7 @@ class MFScalar(MFParam, Generic[T]):
             self._value = value
         else:
             raise ValueError(f"Unsupported scalar: {value}")
+        self.dirty = True
 
 
 class MFKeyword(MFScalar[bool]):
@@ -1,4 +1,6 @@
+from contextlib import nullcontext
 from pathlib import Path
+from time import perf_counter
 from typing import Dict, Optional
 
 from flopy4.block import MFBlock
@@ -10,9 +12,44 @@ from flopy4.ispec.prt_model import PrtModel
 from flopy4.ispec.sim_nam import SimNam
 from flopy4.ispec.sim_tdis import SimTdis
 from flopy4.ispec.sln_ims import SlnIms
-from flopy4.model import MFModel
+from flopy4.model import EXECUTORS, MFModel, MFModels, write_components
 from flopy4.package import MFPackage
-from flopy4.resolver import Resolve
+from flopy4.resolver import Resolver, invalidate
+
+
+def load_component(cls, fname, **kwargs):
+    """
+    Load a component of the given class from the given file, and
+    time the load.
+    """
+    start = perf_counter()
+    with open(fname, "r") as f:
+        component = cls.load(f, **kwargs)
+    return component, perf_counter() - start
+
+
+def load_components(tasks, components, executor=None, timings=None):
+    """
+    Load components from (name, class, file, kwargs) tasks into the
+    given dictionary, in task order. If an executor is given, the
+    components load concurrently. Load times (in seconds, measured
+    where the component is loaded) are recorded in `timings`.
+    """
+    if executor is None:
+        results = {
+            name: load_component(cls, fname, **kwargs)
+            for name, cls, fname, kwargs in tasks
+        }
+    else:
+        futures = {
+            name: executor.submit(load_component, cls, fname, **kwargs)
+            for name, cls, fname, kwargs in tasks
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    for name, (component, elapsed) in results.items():
+        components[name] = component
+        if timings is not None:
+            timings[name] = elapsed
 
 
 class MFSimulation:
@@ -28,35 +65,77 @@ class MFSimulation:
         exchanges: Optional[Dict[str, Dict]] = {},
         solvers: Optional[Dict[str, Dict]] = {},
         nam: Optional[Dict[str, Dict]] = {},
+        timings: Optional[Dict[str, float]] = None,
     ):
         self.name = name
         self.mempath = name
         self.tdis = tdis
+        self._resolver = Resolver(name=name)
         self.models = models
         self.exchanges = exchanges
         self.solvers = solvers
         self.nam = nam
+        self.timings = timings or {}
 
-        self._resolv = Resolve(name=name, models=models)
+    @property
+    def models(self) -> MFModels:
+        """
+        The simulation's models. Memory paths are resolved
+        within the simulation, via an index which is scoped
+        to it and follows changes to its models.
+        """
+        return self._models
+
+    @models.setter
+    def models(self, models: Optional[Dict[str, MFModel]]):
+        invalidate()
+        self._models = MFModels(models, self._resolver)
+        self._resolver.models = self._models
 
     @classmethod
     def load(cls, f, **kwargs):
-        """Load mfsim.nam from file."""
+        """
+        Load mfsim.nam from file.
+
+        If `parallel` is "thread" or "process", models, exchanges
+        and solvers are loaded concurrently in a pool of that kind
+        with `max_workers` workers. A process pool sidesteps the
+        GIL for CPU-bound parsing; components are pickled back to
+        the parent process. The time taken to load each component
+        is recorded in the simulation's `timings`, by name.
+        """
         models = dict()
         exchanges = dict()
         solvers = dict()
+        timings = dict()
         sim_name = "sim"
         mempath = sim_name
 
+        parallel = kwargs.pop("parallel", None)
+        max_workers = kwargs.pop("max_workers", None)
+        if parallel is not None and parallel not in EXECUTORS:
+            raise ValueError(f"Unsupported parallel mode: {parallel}")
+
         kwargs["mempath"] = f"{mempath}"
         kwargs["ftype"] = "nam6"
 
         nam = SimNam.load(f, **kwargs)
 
+        start = perf_counter()
         tdis = MFSimulation.load_tdis(nam, **kwargs)
-        MFSimulation.load_models(nam, models, **kwargs)
-        MFSimulation.load_exchanges(nam, exchanges, **kwargs)
-        MFSimulation.load_solvers(nam, solvers, **kwargs)
+        timings["tdis"] = perf_counter() - start
+
+        pool = (
+            nullcontext()
+            if parallel is None
+            else EXECUTORS[parallel](max_workers=max_workers)
+        )
+        with pool as executor:
+            kwargs["executor"] = executor
+            kwargs["timings"] = timings
+            MFSimulation.load_models(nam, models, **kwargs)
+            MFSimulation.load_exchanges(nam, exchanges, **kwargs)
+            MFSimulation.load_solvers(nam, solvers, **kwargs)
 
         return cls(
             name=sim_name,
@@ -65,6 +144,7 @@ class MFSimulation:
             exchanges=exchanges,
             solvers=solvers,
             nam=nam,
+            timings=timings,
         )
 
     @staticmethod
@@ -92,9 +172,12 @@ class MFSimulation:
         blocks: Dict[str, MFBlock],
         models: Dict[str, MFModel],
         mempath,
+        executor=None,
+        timings=None,
         **kwargs,
     ):
         """Load simulation models"""
+        tasks = []
         assert "models" in blocks
         for param_name, param in blocks["models"].items():
             if param_name != "models":
@@ -116,19 +199,25 @@ class MFSimulation:
                     model = PrtModel
                 else:
                     model = None
-                with open(mfname, "r") as f:
-                    kwargs["mtype"] = mtype.lower()
-                    kwargs["mempath"] = f"{mempath}/{mname}"
-                    models[mname] = model.load(f, **kwargs)
+                kwrgs = {
+                    **kwargs,
+                    "mtype": mtype.lower(),
+                    "mempath": f"{mempath}/{mname}",
+                }
+                tasks.append((mname, model, mfname, kwrgs))
+        load_components(tasks, models, executor, timings)
 
     @staticmethod
     def load_exchanges(
         blocks: Dict[str, MFBlock],
         exchanges: Dict[str, Dict],
         mempath,
+        executor=None,
+        timings=None,
         **kwargs,
     ):
         """Load simulation exchanges"""
+        tasks = []
         assert "exchanges" in blocks
         for param_name, param in blocks["exchanges"].items():
             if param_name != "exchanges":
@@ -149,20 +238,23 @@ class MFSimulation:
                     exch = ExgGwfgwf
                 else:
                     exch = None
-                with open(exgfile, "r") as f:
-                    ename = exgtype.replace("6", "")
-                    ename = f"{ename}_{i}"
-                    kwargs["mempath"] = f"{mempath}/{ename}"
-                    exchanges[ename] = exch.load(f, **kwargs)
+                ename = exgtype.replace("6", "")
+                ename = f"{ename}_{i}"
+                kwrgs = {**kwargs, "mempath": f"{mempath}/{ename}"}
+                tasks.append((ename, exch, exgfile, kwrgs))
+        load_components(tasks, exchanges, executor, timings)
 
     @staticmethod
     def load_solvers(
         blocks: Dict[str, MFBlock],
         solvers: Dict[str, Dict],
         mempath,
+        executor=None,
+        timings=None,
         **kwargs,
     ):
         """Load simulation solvers"""
+        tasks = []
         assert "solutiongroup" in blocks
         for param_name, param in blocks["solutiongroup"].items():
             if param_name != "solutiongroup":
@@ -181,18 +273,52 @@ class MFSimulation:
                     sln = SlnIms
                 else:
                     sln = None
-                with open(slnfname, "r") as f:
-                    slnname = slntype.replace("6", "")
-                    slnname = f"{slnname}_{i}"
-                    kwargs["mempath"] = f"{mempath}/{slnname}"
-                    solvers[slnname] = sln.load(f, **kwargs)
+                slnname = slntype.replace("6", "")
+                slnname = f"{slnname}_{i}"
+                kwrgs = {**kwargs, "mempath": f"{mempath}/{slnname}"}
+                tasks.append((slnname, sln, slnfname, kwrgs))
+        load_components(tasks, solvers, executor, timings)
 
     def write(self, basepath, **kwargs):
-        """Write the simulation to files."""
+        """
+        Write the simulation to files.
+
+        Keyword arguments are passed through to each component.
+        For instance, `binary_threshold` writes internal arrays
+        larger than the given number of values to external
+        binary files alongside the package files.
+
+        If `parallel` is "thread" or "process", all files are
+        written concurrently in a pool of that kind with
+        `max_workers` workers. Files are written atomically:
+        each is written to a temporary file, and none replace
+        the originals until all have been written in full.
+
+        Only components modified since they were last written
+        to the same path are written, unless `force` is true.
+        If `checksum` is true, checksum files are kept next to
+        each file, so that even a new process skips files whose
+        content is unchanged.
+        """
+        parallel = kwargs.pop("parallel", None)
+        max_workers = kwargs.pop("max_workers", None)
+        force = kwargs.get("force", False)
+        if parallel is not None and parallel not in EXECUTORS:
+            raise ValueError(f"Unsupported parallel mode: {parallel}")
+
         path = Path(basepath)
-        with open(path / "mfsim.nam", "w") as f:
-            self.nam.write(f, **kwargs)
-        with open(path / f"{self.name}.tdis", "w") as f:
-            self.tdis.write(f, **kwargs)
-        for model in self.models:
-            self.models[model].write(basepath, **kwargs)
+        kwrgs = {**kwargs, "basepath": path}
+        tasks = [
+            (self.nam, path / "mfsim.nam", kwrgs),
+            (self.tdis, path / f"{self.name}.tdis", kwrgs),
+        ]
+        for model in self.models.values():
+            tasks.extend(model.write_tasks(basepath, **kwargs))
+
+        pool = (
+            nullcontext()
+            if parallel is None
+            else EXECUTORS[parallel](max_workers=max_workers)
+        )
+        with pool as executor:
+            write_components(tasks, executor, force)
@@ -1,3 +1,11 @@
+import os
+from contextlib import contextmanager
+from hashlib import sha256
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+
 def find_upper(s):
     for i in range(len(s)):
         if s[i].isupper():
@@ -12,21 +20,58 @@ def flatten(d):
         yield d
 
 
-def strip(line):
+def temp_path(path) -> Path:
     """
-    Remove comments and replace commas from input text
-    for a free formatted modflow input file
+    Return a unique temporary file path in the same directory
+    as the given path, so the former can be atomically renamed
+    to the latter.
+    """
+    path = Path(path)
+    return path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+
 
-    Parameters
-    ----------
-        line : str
-            a line of text from a modflow input file
+@contextmanager
+def atomic_write(path, mode="w", renames: Optional[list] = None):
+    """
+    Open a temporary file alongside `path` for writing, and
+    move it over `path` once written, or remove it if there
+    is an error, so `path` is never left partially written.
+
+    If a `renames` list is given, the temporary file is not
+    moved but a (temporary path, path) pair is added to the
+    list instead, so the caller can move it along with other
+    files once all have been written.
+    """
+    tmp = temp_path(path)
+    try:
+        with open(tmp, mode) as f:
+            yield f
+        if renames is None:
+            os.replace(tmp, path)
+        else:
+            renames.append((tmp, Path(path)))
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
-    Returns
-    -------
-        str : line with comments removed and commas replaced
+
+def digest(data: bytes) -> str:
+    """Return a hex digest of the given content."""
+    return sha256(data).hexdigest()
+
+
+def checksum_path(path) -> Path:
+    """Return the path of the checksum file for the given path."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.sha256")
+
+
+def read_checksum(path) -> Optional[str]:
+    """
+    Return the stored checksum for the given file, or None if
+    the file or its checksum file does not exist.
     """
-    for comment_flag in ["//", "#", "!"]:
-        line = line.split(comment_flag)[0]
-    line = line.strip()
-    return line.replace(",", " ")
+    sidecar = checksum_path(path)
+    if not (Path(path).exists() and sidecar.exists()):
+        return None
+    return sidecar.read_text().strip()
@@ -1,6 +1,10 @@
+from io import StringIO
+
 import numpy as np
+import pytest
+from flopy.utils.binaryfile import BinaryHeader
 
-from flopy4.array import MFArray
+from flopy4.array import MFArray, MFArrayType
 
 
 def test_array_load_1d(tmp_path):
@@ -77,3 +81,368 @@ def test_array_load_layered(tmp_path):
         array = MFArray.load(f, cwd=tmp_path, shape=(3, 1, 3))
         assert array.name == name
         assert np.allclose(array.value, np.array(v))
+
+
+def test_array_load_mf6_number_formats(tmp_path):
+    name = "array"
+    fpth = tmp_path / f"{name}.txt"
+    how = "INTERNAL"
+    value = "1.0E+02 -2.5 1.0D+02\n  4*4.0 -1d-1\n"
+
+    with open(fpth, "w") as f:
+        f.write(f"{name.upper()}\n{how}\n{value}END\n")
+    with open(fpth, "r") as f:
+        array = MFArray.load(f, cwd=tmp_path, shape=(2, 4))
+        assert array.name == name
+        assert np.allclose(
+            array.value,
+            np.array([[100.0, -2.5, 100.0, 4.0], [4.0, 4.0, 4.0, -0.1]]),
+        )
+        assert f.readline() == "END\n"
+
+
+def test_array_read_unknown_shape(tmp_path):
+    fpth = tmp_path / "array.txt"
+
+    with open(fpth, "w") as f:
+        f.write("1.0 2.0\n-3.0\nEND\n")
+    with open(fpth, "r") as f:
+        array = MFArray.read_array(f)
+        assert np.allclose(array, np.array([1.0, 2.0, -3.0]))
+        assert f.readline() == "END\n"
+
+
+def test_array_load_external_lazy(tmp_path):
+    name = "array"
+    fpth = tmp_path / f"{name}.txt"
+    extfpth = f"external_{name}.txt"
+    v = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+    with open(tmp_path / extfpth, "w") as f:
+        f.write(" ".join(str(x) for y in v for x in y))
+    with open(fpth, "w") as f:
+        f.write(f"{name.upper()}\nOPEN/CLOSE {extfpth} FACTOR 2.0\n")
+    with open(fpth, "r") as f:
+        array = MFArray.load(f, cwd=tmp_path, shape=(2, 3), lazy=True)
+        assert array.deferred
+        assert array._value is None
+        assert array.factor == 2.0
+        assert np.allclose(array.value, np.array(v) * 2.0)
+        assert not array.deferred
+        assert "FACTOR 2.0" in str(array)
+
+
+def test_array_load_external_binary_lazy(tmp_path):
+    name = "array"
+    fpth = tmp_path / f"{name}.txt"
+    extfpth = f"external_{name}.bin"
+    v = np.arange(24, dtype=np.float64).reshape((2, 3, 4))
+
+    header = BinaryHeader.create(
+        bintype="vardis", precision="double", text=name, m1=24, m2=1, m3=1
+    )
+    with open(tmp_path / extfpth, "wb") as f:
+        header.tofile(f)
+        v.tofile(f)
+    with open(fpth, "w") as f:
+        f.write(f"{name.upper()}\nOPEN/CLOSE {extfpth} (BINARY)\n")
+    with open(fpth, "r") as f:
+        array = MFArray.load(f, cwd=tmp_path, shape=(2, 3, 4), lazy=True)
+        assert array.deferred
+        assert np.allclose(array[1], v[1])
+        assert isinstance(array._value, np.memmap)
+        assert "(BINARY)" in str(array)
+
+    # writes stay in memory
+    array[0] = 0.0
+    assert np.allclose(array[0], 0.0)
+    assert np.allclose(np.fromfile(tmp_path / extfpth, offset=52)[:4], v[0, 0])
+
+
+def test_array_constant_view():
+    shape = (10, 100, 100)
+    array = MFArray(
+        shape, array=2.0, how=MFArrayType.constant, factor=3.0, name="a"
+    )
+
+    # constant arrays are never materialized on access
+    assert not array.raw.flags.writeable
+    assert array.raw.strides == (0, 0, 0)
+    assert np.allclose(array.value, 6.0)
+    assert array.mean() == 6.0
+    assert array.sum() == 6.0 * 10 * 100 * 100
+    assert array.min() == array.max() == array.median() == 6.0
+    assert array.std() == 0.0
+    assert next(iter(array)) == 2.0
+
+    # uniform writes keep the array constant
+    array[:] = 4.0
+    assert array.how == MFArrayType.constant
+    assert array._value == 4.0
+
+    # writing individual elements materializes it
+    array[0, 0, 0] = 1.0
+    assert array.how == MFArrayType.internal
+    assert array.raw[0, 0, 0] == 1.0
+    assert array.raw[0, 0, 1] == 4.0
+
+
+def test_array_value_cache():
+    array = MFArray(
+        (2, 3), array=np.arange(6, dtype=np.float64), factor=2.0, name="a"
+    )
+
+    value = array.value
+    assert array.value is value
+    assert array.cache_info() == (1, 1)
+    assert not value.flags.writeable
+
+    # each kind of mutation invalidates the cache
+    array[0, 0] = 10.0
+    assert array.value[0, 0] == 20.0
+    array += 1.0
+    assert array.value[0, 0] == 22.0
+    np.multiply(array, 2.0)
+    assert array.value[0, 0] == 44.0
+    array.value = np.zeros((2, 3))
+    assert np.allclose(array.value, 0.0)
+    assert array.cache_info() == (1, 5)
+
+
+def test_array_no_writable_views():
+    array = MFArray((2, 3), array=np.arange(6, dtype=np.float64), name="a")
+    array.dirty = False
+    value = array.value
+
+    # the raw array, value and selections are read-only, so
+    # edits can't bypass the value cache or dirty flag
+    assert not array.raw.flags.writeable
+    with pytest.raises(ValueError):
+        array.raw[0] = 99.0
+    with pytest.raises(ValueError):
+        array.value[0] = 99.0
+    with pytest.raises(ValueError):
+        array[0][:] = 99.0
+    with pytest.raises(ValueError):
+        array[[0]][:] = 99.0
+    assert np.array_equal(array.raw[0], [0.0, 1.0, 2.0])
+    assert array.value is value
+    assert not array.dirty
+
+    array[0] += 99.0
+    assert np.array_equal(array.value[0], [99.0, 100.0, 101.0])
+    assert array.dirty
+
+
+def test_array_layered_contiguous(tmp_path):
+    name = "array"
+    fpth = tmp_path / f"{name}.txt"
+
+    with open(fpth, "w") as f:
+        f.write(f"{name.upper()} LAYERED\n")
+        f.write("  CONSTANT 1.0\n")
+        f.write("  INTERNAL FACTOR 2.0\n    1.0 2.0 3.0\n")
+        f.write("  CONSTANT 3.0\n")
+    with open(fpth, "r") as f:
+        array = MFArray.load(f, cwd=tmp_path, shape=(3, 1, 3))
+
+    assert array.how == [
+        MFArrayType.constant,
+        MFArrayType.internal,
+        MFArrayType.constant,
+    ]
+    assert array.factor == [1.0, 2.0, 1.0]
+    assert array.raw.shape == (3, 1, 3)
+    assert np.shares_memory(array.raw, array._value)
+    assert np.allclose(
+        array.value, [[[1.0, 1.0, 1.0]], [[2.0, 4.0, 6.0]], [[3.0] * 3]]
+    )
+
+    # layers are views into the contiguous array
+    array[2] += 1.0
+    assert array.how[2] == MFArrayType.constant
+    assert np.allclose(array.raw[2], 4.0)
+    array[0, 0, 0] = 0.0
+    assert array.how[0] == MFArrayType.internal
+    assert "CONSTANT 4.0" in str(array)
+
+    # non-uniform in-place operations materialize constant layers
+    array += np.array([0.0, 1.0, 2.0])
+    assert array.how == [MFArrayType.internal] * 3
+    assert "CONSTANT" not in str(array)
+    assert np.allclose(array.raw[2], [4.0, 5.0, 6.0])
+
+
+def test_array_layered_external_lazy(tmp_path):
+    name = "array"
+    fpth = tmp_path / f"{name}.txt"
+    np.savetxt(tmp_path / "l1.txt", [[1.0, 2.0, 3.0]])
+
+    # the first layer is the deferred one
+    with open(fpth, "w") as f:
+        f.write(f"{name.upper()} LAYERED\n")
+        f.write("  OPEN/CLOSE l1.txt\n")
+        f.write("  CONSTANT 3.0\n")
+    with open(fpth, "r") as f:
+        array = MFArray.load(f, cwd=tmp_path, shape=(2, 1, 3), lazy=True)
+
+    assert array.deferred
+    assert np.allclose(array.value, [[[1.0, 2.0, 3.0]], [[3.0] * 3]])
+    assert not array.deferred
+
+    # replacing the value discards deferred layers
+    with open(fpth, "r") as f:
+        array = MFArray.load(f, cwd=tmp_path, shape=(2, 1, 3), lazy=True)
+    array.value = np.zeros((2, 1, 3))
+    assert not array.deferred
+    assert np.array_equal(array.value, np.zeros((2, 1, 3)))
+
+
+def test_array_write_format():
+    values = np.arange(12, dtype=np.float64).reshape((2, 6)) / 4
+
+    buffer = StringIO()
+    MFArray.write_array(buffer, values, indent="")
+    assert buffer.getvalue() == (
+        "0.0 0.25 0.5 0.75 1.0 1.25\n1.5 1.75 2.0 2.25 2.5 2.75\n"
+    )
+
+    buffer = StringIO()
+    MFArray.write_array(buffer, values, columns=4, width=6, digits=2)
+    lines = buffer.getvalue().splitlines()
+    assert lines[0] == "           0   0.25    0.5   0.75"
+    assert lines[1] == "           1    1.2"
+    assert len(lines) == 4
+
+    # round trip
+    buffer.seek(0)
+    expected = [float(f"{v:.2G}") for v in values.ravel()]
+    assert np.allclose(MFArray.read_array(buffer, values.shape), expected)
+
+    # integers are written in full
+    buffer = StringIO()
+    MFArray.write_array(buffer, np.array([1234567, -1, 0]), digits=2)
+    assert buffer.getvalue() == "      1234567 -1 0\n"
+
+
+def test_array_write_internal_roundtrip(tmp_path):
+    shape = (3, 4, 500)
+    values = np.random.default_rng(0).random(shape)
+    array = MFArray(shape, array=values.ravel(), factor=2.0, name="a")
+
+    fpth = tmp_path / "array.txt"
+    with open(fpth, "w") as f:
+        array.write(f)
+    with open(fpth, "r") as f:
+        loaded = MFArray.load(f, cwd=tmp_path, shape=shape)
+    assert loaded.factor == 2.0
+    assert np.array_equal(loaded.raw, values)
+
+
+def test_array_write_binary_threshold(tmp_path):
+    name = "k"
+    v = np.arange(24, dtype=np.float64).reshape((2, 3, 4))
+    array = MFArray((2, 3, 4), array=v, name=name)
+
+    f = StringIO()
+    array.write(f, binary_threshold=10, basepath=tmp_path, prefix="npf")
+    extfpth = f"npf.{name}.bin"
+    assert f"OPEN/CLOSE {extfpth} (BINARY)" in f.getvalue()
+    assert array.how == MFArrayType.internal
+    assert np.allclose(np.fromfile(tmp_path / extfpth, offset=52), v.ravel())
+
+    with open(tmp_path / "npf.txt", "w") as fw:
+        fw.write(f.getvalue())
+    with open(tmp_path / "npf.txt", "r") as fr:
+        loaded = MFArray.load(fr, cwd=tmp_path, shape=(2, 3, 4))
+    assert np.allclose(loaded.value, v)
+
+    # small arrays stay internal
+    f = StringIO()
+    array.write(f, binary_threshold=100, basepath=tmp_path)
+    assert "INTERNAL" in f.getvalue()
+
+
+def test_array_write_binary_threshold_layered(tmp_path):
+    v = np.arange(24, dtype=np.float64).reshape((2, 3, 4))
+    array = MFArray(
+        (2, 3, 4),
+        array=v,
+        layered=True,
+        name="k",
+    )
+    assert array.how == [MFArrayType.internal] * 2
+    assert array.factor == [1.0, 1.0]
+
+    f = StringIO()
+    array.write(f, binary_threshold=10, basepath=tmp_path, prefix="npf")
+    text = f.getvalue()
+    for i in range(2):
+        extfpth = tmp_path / f"npf.k.layer{i + 1}.bin"
+        assert f"OPEN/CLOSE {extfpth.name} (BINARY)" in text
+        assert np.allclose(np.fromfile(extfpth, offset=52), v[i].ravel())
+
+
+def test_array_set_value_constant_layers():
+    array = MFArray(
+        (2, 3),
+        array=np.array([[0.0] * 3, [3.0] * 3]),
+        how=MFArrayType.constant,
+        layered=True,
+        name="a",
+    )
+    array.value = np.arange(6, dtype=np.float64).reshape((2, 3))
+    assert array.how == [MFArrayType.internal] * 2
+
+    f = StringIO()
+    array.write(f)
+    f.seek(0)
+    loaded = MFArray.load(f, cwd=None, shape=(2, 3))
+    assert np.array_equal(loaded.value, array.value)
+
+    # non-layered constants are materialized too
+    array = MFArray((2, 3), array=1.0, how=MFArrayType.constant, name="a")
+    array.value = np.arange(6, dtype=np.float64).reshape((2, 3))
+    assert array.how == MFArrayType.internal
+    assert np.array_equal(array.value.ravel(), np.arange(6))
+
+
+def test_array_write_binary_integer(tmp_path):
+    # integer arrays are written as 32-bit integers as MF6
+    # expects, even if their values are floats
+    v = np.array([1.0, 0.0, -1.0, 2.0] * 3)
+    array = MFArray((3, 4), array=v, name="idomain", type="integer")
+
+    f = StringIO()
+    array.write(f, binary_threshold=10, basepath=tmp_path, prefix="dis")
+    extfpth = tmp_path / "dis.idomain.bin"
+    assert np.array_equal(np.fromfile(extfpth, dtype=np.int32, offset=52), v)
+
+    f.seek(0)
+    loaded = MFArray.load(f, cwd=tmp_path, shape=(3, 4), type="integer")
+    assert loaded.raw.dtype == np.int32
+    assert np.array_equal(loaded.value, v.reshape((3, 4)))
+
+    # the data type doesn't depend on how the array is stored
+    f = StringIO()
+    array.write(f)
+    f.seek(0)
+    loaded = MFArray.load(f, cwd=tmp_path, shape=(3, 4), type="integer")
+    assert loaded.raw.dtype == np.int32
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_array_write_binary_integer_layered(tmp_path, lazy):
+    v = np.array([1, 0, -1, 2] * 6, dtype=np.int32).reshape((2, 3, 4))
+    array = MFArray(
+        (2, 3, 4), array=v, layered=True, name="idomain", type="integer"
+    )
+
+    f = StringIO()
+    array.write(f, binary_threshold=10, basepath=tmp_path, prefix="dis")
+    f.seek(0)
+    loaded = MFArray.load(
+        f, cwd=tmp_path, shape=(2, 3, 4), type="integer", lazy=lazy
+    )
+    assert loaded.raw.dtype == np.int32
+    assert np.array_equal(loaded.value, v)
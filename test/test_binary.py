@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from flopy4.mf6.binary import BinaryArray, BinaryException, BinaryList
+
+
+def test_binary_array_roundtrip(tmp_path):
+    fpth = tmp_path / "array.bin"
+    v = np.arange(24, dtype=np.float64).reshape((2, 3, 4))
+    binary = BinaryArray(shape=v.shape)
+    binary.write(fpth, v, text="k")
+
+    assert np.array_equal(binary.read(fpth), v)
+    header = binary.read_headers(fpth)
+    assert header["m1"][0] == 24
+    assert header["text"][0].strip() == b"K"
+
+
+def test_binary_array_layered(tmp_path):
+    fpth = tmp_path / "array.bin"
+    v = np.arange(24, dtype=np.int32).reshape((2, 3, 4))
+    binary = BinaryArray(shape=v.shape, dtype=np.int32)
+    binary.write(fpth, v, text="idomain", layered=True)
+
+    header = binary.read_headers(fpth, layered=True)
+    assert header["m1"].tolist() == [4, 4]
+    assert header["m2"].tolist() == [3, 3]
+    assert header["m3"].tolist() == [1, 2]
+
+    mapped = binary.read(fpth, layered=True, memmap=True)
+    assert np.array_equal(mapped, v)
+    mapped[0] = -1
+    assert np.array_equal(binary.read(fpth, layered=True), v)
+
+    with pytest.raises(BinaryException):
+        BinaryArray(shape=(3, 3, 4)).read(fpth, layered=True)
+
+
+def test_binary_list_roundtrip(tmp_path):
+    fpth = tmp_path / "list.bin"
+    binary = BinaryList(
+        grid_type="vertex", fields=[("q", np.float64), ("iaux", np.int32)]
+    )
+    binary.write(fpth, [(1, 3, 0.5, 7), (2, 4, 1.5, 8)])
+
+    records = binary.read(fpth)
+    assert records.dtype.names == ("layer", "cell2d", "q", "iaux")
+    assert records["q"].tolist() == [0.5, 1.5]
+    assert binary.read_binary_data_from_file(fpth) == [
+        ((0, 2), 0.5, 7),
+        ((1, 3), 1.5, 8),
+    ]
+
+
+def test_binary_list_columns(tmp_path):
+    fpth = tmp_path / "list.bin"
+    n = 1000
+    cellid = np.stack(
+        [np.zeros(n), np.arange(n) // 10, np.arange(n) % 10], axis=1
+    ).astype(np.int32)
+    q = np.linspace(-1.0, 1.0, n)
+    binary = BinaryList(fields=[("q", np.float64)])
+    binary.write_columns(fpth, {"cellid": cellid, "q": q})
+
+    records = binary.read(fpth)
+    assert records["row"][12] == 2 and records["col"][12] == 3
+
+    columns = binary.read_columns(fpth)
+    assert columns["cellid"].dtype == np.int32
+    assert np.array_equal(columns["cellid"], cellid)
+    assert np.array_equal(columns["q"], q)
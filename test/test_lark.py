@@ -1,8 +1,14 @@
+from io import StringIO
 from os import linesep
 from pathlib import Path
+from time import perf_counter
 
 import numpy as np
+import pytest
 
+from flopy4.array import ConstantArray, MFArray
+from flopy4.block import MFBlock
+from flopy4.mf6.binary import BinaryArray
 from flopy4.mf6.io import MF6Transformer
 from flopy4.mf6.io import make_parser as make_mf6_parser
 from flopy4.mf6.io.spec import DFNTransformer
@@ -37,6 +43,12 @@ MF6_PARSER = make_mf6_parser(
     dict_blocks=["options", "packagedata"],
     list_blocks=["period"],
 )
+MF6_LALR_PARSER = make_mf6_parser(
+    params=["k", "i", "d", "s", "f", "a"],
+    dict_blocks=["options", "packagedata"],
+    list_blocks=["period"],
+    parser="lalr",
+)
 MF6_TRANSFORMER = MF6Transformer()
 
 
@@ -47,6 +59,15 @@ def test_parse_mf6():
     print(linesep + tree.pretty())
 
 
+def test_make_parser_cached():
+    parser = make_mf6_parser(
+        params=("k", "i", "d", "s", "f", "a"),
+        dict_blocks=("options", "packagedata"),
+        list_blocks=("period",),
+    )
+    assert parser is MF6_PARSER
+
+
 def test_transform_mf6():
     tree = MF6_PARSER.parse(COMPONENT)
     data = MF6_TRANSFORMER.transform(tree)
@@ -63,6 +84,143 @@ def test_transform_mf6():
     assert data["period 2"][0] == ("STEPS", 1, 2, 3)
 
 
+def test_transform_mf6_lalr():
+    earley = MF6_TRANSFORMER.transform(MF6_PARSER.parse(COMPONENT))
+    lalr = MF6_TRANSFORMER.transform(MF6_LALR_PARSER.parse(COMPONENT))
+    assert lalr.keys() == earley.keys()
+    assert lalr["options"] == earley["options"]
+    assert np.array_equal(lalr["packagedata"]["a"], earley["packagedata"]["a"])
+    assert lalr["period 1"] == earley["period 1"]
+    assert lalr["period 2"] == earley["period 2"]
+
+
+def test_transform_mf6_lalr_array():
+    text = """
+# comment
+BEGIN PACKAGEDATA
+  A
+    INTERNAL FACTOR 2.0  # another
+      1.0 2.0
+      3.0D0 2*4
+
+  I 1
+END PACKAGEDATA
+"""
+    data = MF6_TRANSFORMER.transform(MF6_LALR_PARSER.parse(text))
+    assert np.array_equal(data["packagedata"]["a"], [2.0, 4.0, 6.0, 8.0, 8.0])
+    assert data["packagedata"]["i"] == 1
+
+
+def test_transform_mf6_lalr_list():
+    text = """
+BEGIN PERIOD 1
+  1 2 3 -1.0D2  # comment
+# comment
+  1 2 4 2.5 well
+
+  STEPS 1 2
+END PERIOD 1
+BEGIN PERIOD 2
+END PERIOD 2
+"""
+    data = MF6_TRANSFORMER.transform(MF6_LALR_PARSER.parse(text))
+    assert data["period 1"] == [
+        (1, 2, 3, -100.0),
+        (1, 2, 4, 2.5, "well"),
+        ("STEPS", 1, 2),
+    ]
+    assert data["period 2"] == []
+
+
+def test_transform_mf6_lalr_lazy_arrays(tmp_path):
+    values = np.arange(6, dtype=np.float64)
+    np.savetxt(tmp_path / "a.txt", values)
+    BinaryArray(shape=6).write(tmp_path / "b.bin", values, text="b")
+    parser = make_mf6_parser(
+        params=["a", "b", "c"],
+        dict_blocks=["griddata"],
+        list_blocks=["period"],
+        parser="lalr",
+    )
+    text = f"""
+BEGIN GRIDDATA
+  A
+    OPEN/CLOSE {tmp_path / "a.txt"} FACTOR 2.0
+  B
+    OPEN/CLOSE {tmp_path / "b.bin"} (BINARY)
+  C
+    CONSTANT 3
+END GRIDDATA
+"""
+    data = MF6_TRANSFORMER.transform(parser.parse(text))["griddata"]
+    a, b, c = data["a"], data["b"], data["c"]
+    assert isinstance(c, ConstantArray)
+    assert c.value == 3.0 and c.shape is None
+    with pytest.raises(ValueError):
+        c.size
+    assert a.deferred and b.deferred
+    assert np.array_equal(a.value, values * 2)
+    assert np.array_equal(b.value, values)
+    assert a.shape == b.shape == (6,)
+
+    # constant arrays take their shape from the transformer
+    transformer = MF6Transformer(shapes={"c": (2, 3)})
+    c = transformer.transform(parser.parse(text))["griddata"]["c"]
+    assert c.shape == (2, 3) and c.size == 6
+    assert np.array_equal(c.view(), np.full((2, 3), 3.0))
+
+
+def test_make_parser_lalr_cache(tmp_path):
+    spec = dict(
+        params=["k"],
+        dict_blocks=["options"],
+        list_blocks=["period"],
+        parser="lalr",
+    )
+    # parsers made without a disk cache don't stop one being made
+    parser = make_mf6_parser(**spec)
+    cached = make_mf6_parser(**spec, cache=tmp_path)
+    assert cached is not parser
+    assert any(tmp_path.glob("mf6-*.lark"))
+    assert make_mf6_parser(**spec, cache=str(tmp_path)) is cached
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("ncells", [1_000, 1_000_000])
+@pytest.mark.parametrize("reader", ["earley", "lalr", "mfblock"])
+def test_benchmark_array_readers(reader, ncells):
+    if reader == "earley" and ncells > 10_000:
+        pytest.skip("Earley parsing is impractical at this size")
+
+    class GriddataBlock(MFBlock):
+        strt = MFArray(block="griddata", shape=(ncells,))
+
+    values = np.random.default_rng(0).random((ncells // 10, 10))
+    lines = "\n".join(" ".join(f"{v:.6f}" for v in row) for row in values)
+    # the earley grammar requires the control line on the same line
+    sep = " " if reader == "earley" else "\n    "
+    text = f"BEGIN GRIDDATA\n  STRT{sep}INTERNAL\n{lines}\nEND GRIDDATA\n"
+
+    if reader != "mfblock":
+        parser = make_mf6_parser(
+            params=["strt"],
+            dict_blocks=["griddata"],
+            list_blocks=["period"],
+            parser=reader,
+        )
+
+    start = perf_counter()
+    if reader == "mfblock":
+        strt = GriddataBlock.load(StringIO(text)).params["strt"]
+    else:
+        data = MF6_TRANSFORMER.transform(parser.parse(text))
+        strt = data["griddata"]["strt"]
+    elapsed = perf_counter() - start
+
+    print(f"{reader}: {ncells} cells in {elapsed:.3f}s")
+    assert np.allclose(strt, values.ravel(), atol=1e-6)
+
+
 DFN_PARSER = make_dfn_parser()
 DFN_TRANSFORMER = DFNTransformer()
 
@@ -1,7 +1,13 @@
+from io import StringIO
+
 import numpy as np
+import pandas as pd
+import pytest
 
+from flopy4.array import MFArray
 from flopy4.block import MFBlock
 from flopy4.compound import MFList
+from flopy4.mf6.binary import BinaryList
 from flopy4.scalar import MFDouble, MFInteger, MFString
 
 
@@ -19,6 +25,20 @@ class TestBlock(MFBlock):
     )
 
 
+class StressBlock(MFBlock):
+    __test__ = False  # tell pytest not to collect
+
+    stress = MFList(
+        params={
+            "cellid": MFArray(shape="(ncelldim)"),
+            "q": MFDouble(),
+        },
+        type="recarray",
+        description="recarray",
+        optional=False,
+    )
+
+
 class SolutionGroup(MFBlock):
     __test__ = False  # tell pytest not to collect
 
@@ -103,3 +123,124 @@ def test_list_load2(tmp_path):
     assert in_list.params["solutiongroup"]["slnmnames"] == [
         "model0 model1 model2 model3 model4"
     ]
+
+
+def test_list_load_binary(tmp_path):
+    extfpth = "stress.bin"
+    records = [(1, 1, 2, -1.0), (2, 2, 3, -2.5)]
+    BinaryList(fields=[("q", np.float64)]).write(tmp_path / extfpth, records)
+
+    fpth = tmp_path / "stress.txt"
+    with open(fpth, "w") as f:
+        f.write("BEGIN STRESS\n")
+        f.write(f"  OPEN/CLOSE {extfpth} (BINARY)\n")
+        f.write("END STRESS\n")
+
+    with open(fpth, "r") as f:
+        block = StressBlock.load(f, cwd=tmp_path, model_shape=(2, 2, 3))
+
+    stress = block.params["stress"]
+    assert np.array_equal(stress["cellid"], [[0, 0, 1], [1, 1, 2]])
+    assert np.allclose(stress["q"], [-1.0, -2.5])
+
+
+def test_list_load_columns(tmp_path):
+    fpth = tmp_path / "stress.txt"
+    with open(fpth, "w") as f:
+        f.write("BEGIN STRESS\n")
+        f.write("  1 1 2 -1.0D0  # comment\n")
+        f.write("\n")
+        f.write("  2 2 3 -2.5\n")
+        f.write("END STRESS\n")
+
+    with open(fpth, "r") as f:
+        block = StressBlock.load(f, model_shape=(2, 2, 3))
+        assert f.readline() == ""
+
+    stress = block.params["stress"]
+    assert stress["cellid"].dtype == np.int32
+    assert np.array_equal(stress["cellid"], [[0, 0, 1], [1, 1, 2]])
+    assert np.allclose(stress["q"], [-1.0, -2.5])
+
+
+def test_list_read_columns_aux():
+    params = {
+        "cellid": MFArray(shape="(ncelldim)"),
+        "q": MFDouble(),
+        "aux": MFArray(shape="(naux)"),
+    }
+
+    # array parameters other than cell ids are floats
+    text = "1 2 3 -1.0 0.5\n1 2 4 -2.0 7.25\n"
+    cellid, q, aux = MFList.read_columns(StringIO(text), params, ncelldim=3)
+    assert np.array_equal(cellid, [[0, 1, 2], [0, 1, 3]])
+    assert np.allclose(q, [-1.0, -2.0])
+    assert aux.dtype == np.float64
+    assert np.allclose(aux, [[0.5], [7.25]])
+
+    text = "1 2 -1.0 0.5 1.5\n"
+    cellid, q, aux = MFList.read_columns(StringIO(text), params, naux=2)
+    assert np.array_equal(cellid, [[0, 1]])
+    assert np.allclose(aux, [[0.5, 1.5]])
+
+
+def test_list_read_columns_ragged():
+    params = {"cellid": MFArray(shape="(ncelldim)"), "q": MFDouble()}
+    text = "1 1 1 -1.0 9\n1 1 2\n"
+    with pytest.raises(ValueError):
+        MFList.read_columns(StringIO(text), params)
+    with pytest.raises(ValueError):
+        MFList.read_columns(StringIO(text), params, ncelldim=3)
+
+
+def test_list_write(tmp_path):
+    fpth = tmp_path / "stress.txt"
+    with open(fpth, "w") as f:
+        f.write("BEGIN STRESS\n")
+        f.write("  1 1 2 -1.0\n")
+        f.write("  2 2 3 0.123456789\n")
+        f.write("END STRESS\n")
+    with open(fpth, "r") as f:
+        block = StressBlock.load(f, model_shape=(2, 2, 3))
+
+    assert str(block).endswith(
+        "\n  1 1 2 -1.0\n  2 2 3 0.123456789\nEND STRESS\n"
+    )
+
+    with open(fpth, "w") as f:
+        block.write(f, width=4, digits=3)
+    with open(fpth, "r") as f:
+        assert "     2    2    3 0.123\n" in f.read()
+        f.seek(0)
+        block = StressBlock.load(f, model_shape=(2, 2, 3))
+    assert np.allclose(block.params["stress"]["q"], [-1.0, 0.123])
+
+
+def test_list_dataframe():
+    params = {
+        "cellid": MFArray(shape="(ncelldim)"),
+        "q": MFDouble(),
+        "boundname": MFString(),
+    }
+    df = pd.DataFrame(
+        {
+            "layer": [0, 0, 1],
+            "row": [0, 1, 1],
+            "col": [1, 2, 2],
+            "q": [-1.0, -2.5, 0.5],
+            "boundname": ["well1", "well2", "well1"],
+        }
+    )
+
+    lst = MFList.from_dataframe(df, params, name="stress")
+    assert np.shares_memory(lst["q"].raw, df["q"].to_numpy())
+    assert np.array_equal(
+        lst["cellid"].value, [[0, 0, 1], [0, 1, 2], [1, 1, 2]]
+    )
+    assert isinstance(lst["boundname"].value, pd.Categorical)
+
+    out = lst.to_dataframe()
+    assert list(out.columns) == ["layer", "row", "col", "q", "boundname"]
+    assert out["boundname"].dtype == "category"
+    assert np.shares_memory(out["q"].to_numpy(), lst["q"].raw)
+    assert out.groupby("boundname", observed=True)["q"].sum()["well1"] == -0.5
@@ -1,9 +1,13 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from time import perf_counter
 
 import numpy as np
 import pytest
 
 from flopy4.ispec.gwf_model import GwfModel
+from flopy4.model import write_components
 
 name = "gwf_1"
 nlay = 3
@@ -82,6 +86,63 @@ def test_load_gwfdis(tmp_path):
             gwf.npf
 
 
+@pytest.mark.parametrize("parallel", ["thread", "process"])
+def test_load_gwf_parallel(tmp_path, parallel):
+    nam_fpth = tmp_path / f"{name}.nam"
+
+    write_inputs(tmp_path)
+
+    with open(nam_fpth, "r") as f:
+        expected = GwfModel.load(f, mempath="sim/gwf_1")
+    with open(nam_fpth, "r") as f:
+        gwf = GwfModel.load(
+            f, mempath="sim/gwf_1", parallel=parallel, max_workers=2
+        )
+
+    assert list(gwf.packages) == list(expected.packages)
+    assert nlay == gwf.packages["dis"]["dimensions"]["nlay"]
+    assert np.array_equal(
+        gwf.packages["ic"]["griddata"]["strt"],
+        expected.packages["ic"]["griddata"]["strt"],
+    )
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("npackages", [1, 10, 100])
+def test_benchmark_package_access(tmp_path, npackages):
+    write_inputs(tmp_path)
+    nam_fpth = tmp_path / f"{name}.nam"
+    with open(nam_fpth, "w") as f:
+        f.write("BEGIN OPTIONS\n")
+        f.write("END OPTIONS\n")
+        f.write("\n")
+        f.write("BEGIN PACKAGES\n")
+        f.write(f"  DIS6  {tmp_path}/{name}.dis  dis\n")
+        for i in range(npackages):
+            f.write(f"  IC6  {tmp_path}/{name}.ic  ic{i}\n")
+        f.write("END PACKAGES\n")
+    with open(nam_fpth, "r") as f:
+        gwf = GwfModel.load(f, mempath="sim/gwf_1")
+
+    strts = [gwf[f"ic{i}"]["griddata"]["strt"] for i in range(npackages)]
+    for strt in strts:
+        strt._invalidate()
+    misses = [strt.cache_info().misses for strt in strts]
+
+    naccess = 1000
+    start = perf_counter()
+    for _ in range(naccess):
+        assert gwf.dis["dimensions"]["nlay"] == nlay
+    elapsed = perf_counter() - start
+
+    print(
+        f"{npackages} packages: "
+        f"{elapsed / naccess * 1e6:.1f}us per attribute access"
+    )
+    # sibling packages' arrays are never evaluated
+    assert [strt.cache_info().misses for strt in strts] == misses
+
+
 def test_write_gwfdis(tmp_path):
     # write input files
     write_inputs(tmp_path)
@@ -98,3 +159,33 @@ def test_write_gwfdis(tmp_path):
     write_dir = tmp_path / "write"
     os.makedirs(write_dir)
     gwf.write(write_dir)
+
+
+class Component:
+    def __init__(self, text):
+        self.text = text
+
+    def write(self, f, **kwargs):
+        if self.text is None:
+            raise ValueError("Failed to write")
+        f.write(self.text)
+
+
+@pytest.mark.parametrize("threads", [False, True])
+def test_write_components_atomic(tmp_path, threads):
+    a = tmp_path / "a.txt"
+    b = tmp_path / "b.txt"
+    a.write_text("old")
+    tasks = [(Component("new"), a, {}), (Component(None), b, {})]
+
+    pool = ThreadPoolExecutor(max_workers=2) if threads else nullcontext()
+    with pool as executor:
+        with pytest.raises(ValueError):
+            write_components(tasks, executor)
+        assert a.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["a.txt"]
+
+        tasks[1] = (Component("new"), b, {})
+        write_components(tasks, executor)
+    assert a.read_text() == b.read_text() == "new"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.txt", "b.txt"]
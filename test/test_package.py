@@ -1,7 +1,10 @@
 import numpy as np
+import pytest
 
 from flopy4.array import MFArray
 from flopy4.block import MFBlock
+from flopy4.compound import MFList
+from flopy4.mf6.index import BlockIndex
 from flopy4.package import MFPackage
 from flopy4.scalar import MFDouble, MFFilename, MFInteger, MFKeyword, MFString
 
@@ -437,3 +440,253 @@ def test_load_gwfdis(tmp_path):
         [1, 1, 1, 1, 1],
     ]
     assert np.allclose(gwfdis.idomain, i)
+
+
+def test_param_access_is_lazy(tmp_path):
+    fpth = tmp_path / "gwf.dis"
+    with open(fpth, "w") as f:
+        f.write("BEGIN DIMENSIONS\n")
+        f.write("  NLAY 1\n")
+        f.write("  NROW 5\n")
+        f.write("  NCOL 5\n")
+        f.write("END DIMENSIONS\n\n")
+        f.write("BEGIN GRIDDATA\n")
+        f.write("  DELR\n    INTERNAL\n      1.0 2.0 3.0 4.0 5.0\n")
+        f.write("END GRIDDATA\n")
+    with open(fpth, "r") as f:
+        gwfdis = TestGwfDis.load(f, mempath="gwf/dis", ftype="dis6")
+
+    # accessing a scalar doesn't evaluate any arrays
+    delr = gwfdis["griddata"]["delr"]
+    delr._invalidate()
+    misses = delr.cache_info().misses
+    assert gwfdis.nlay == 1
+    assert gwfdis.ncol == 5
+    assert delr.cache_info().misses == misses
+    assert np.array_equal(gwfdis.delr, [1.0, 2.0, 3.0, 4.0, 5.0])
+    assert delr.cache_info().misses == misses + 1
+
+    # the parameter index follows block changes
+    dims = TestGwfDis.blocks["dimensions"]
+    gwfdis["dimensions"] = type(dims)(
+        name="dimensions", params={"nlay": 2, "nrow": 5, "ncol": 5}
+    )
+    assert gwfdis.nlay == 2
+
+
+class TestGwfWel(MFPackage):
+    __test__ = False  # tell pytest not to collect
+
+    maxbound = MFInteger(
+        block="dimensions",
+        type="integer",
+        description="maximum number of wells",
+    )
+    period = MFList(
+        block="period",
+        params={
+            "cellid": MFArray(shape="(ncelldim)"),
+            "q": MFDouble(),
+        },
+        type="recarray",
+        description="well rates",
+        optional=False,
+    )
+
+
+def write_wel(fpth, nper):
+    with open(fpth, "w") as f:
+        f.write("BEGIN OPTIONS\n")
+        f.write("END OPTIONS\n\n")
+        f.write("BEGIN DIMENSIONS\n")
+        f.write("  MAXBOUND 1\n")
+        f.write("END DIMENSIONS\n\n")
+        for kper in range(1, nper + 1):
+            f.write(f"BEGIN PERIOD {kper}\n")
+            f.write(f"  1 1 {kper} {-kper}.0\n")
+            f.write(f"END PERIOD {kper}\n\n")
+
+
+def test_load_list_maxbound(tmp_path, monkeypatch):
+    fpth = tmp_path / "gwf.wel"
+    write_wel(fpth, 1)
+    kwargs = {
+        "mempath": "gwf/wel",
+        "ftype": "wel6",
+        "model_shape": (1, 1, 1),
+    }
+
+    # list columns are preallocated to maxbound rows
+    sizes = []
+    read_columns = MFList.read_columns
+
+    def spy(f, params, nrows=None, *args):
+        sizes.append(nrows)
+        return read_columns(f, params, nrows, *args)
+
+    monkeypatch.setattr(MFList, "read_columns", staticmethod(spy))
+    with open(fpth, "r") as f:
+        package = TestGwfWel.load(f, **kwargs)
+    assert sizes == [1]
+    period = package["period"].params["period"]
+    assert np.allclose(period["q"], [-1.0])
+
+    # and may not have more
+    text = fpth.read_text()
+    fpth.write_text(text.replace("END PERIOD", "  1 1 1 -2.0\nEND PERIOD"))
+    with open(fpth, "r") as f:
+        with pytest.raises(ValueError, match="maxbound"):
+            TestGwfWel.load(f, **kwargs)
+
+
+def test_block_index(tmp_path):
+    fpth = tmp_path / "gwf.wel"
+    write_wel(fpth, 3)
+    text = fpth.read_bytes()
+
+    index = BlockIndex.scan(fpth)
+    assert list(index) == [
+        ("options", None),
+        ("dimensions", None),
+        ("period", 1),
+        ("period", 2),
+        ("period", 3),
+    ]
+    assert index.indices("period") == [1, 2, 3]
+    start, end = index["period", 2]
+    assert text[start:end] == b"BEGIN PERIOD 2\n  1 1 2 -2.0\nEND PERIOD 2\n"
+
+    # cached in a sidecar file, which is ignored once stale
+    assert BlockIndex.load(fpth, cache=True) == index
+    assert BlockIndex.sidecar(fpth).is_file()
+    assert BlockIndex.load(fpth, cache=True) == index
+    write_wel(fpth, 4)
+    assert ("period", 4) in BlockIndex.load(fpth, cache=True)
+
+    # comments and commas are handled like the loaders do
+    fpth.write_bytes(
+        b"BEGIN OPTIONS # END OPTIONS\nEND OPTIONS\n"
+        b"BEGIN PERIOD,2 ! x\n  1 1 2 -2.0\nEND PERIOD,2\n"
+    )
+    index = BlockIndex.scan(fpth)
+    assert list(index) == [("options", None), ("period", 2)]
+    assert index["period", 2].end == fpth.stat().st_size
+
+    fpth.write_text("BEGIN OPTIONS\nEND DIMENSIONS\n")
+    with pytest.raises(ValueError):
+        BlockIndex.scan(fpth)
+
+
+def test_load_block(tmp_path):
+    fpth = tmp_path / "gwf.wel"
+    write_wel(fpth, 1000)
+    # blocks before the one requested aren't parsed
+    text = fpth.read_text().replace("1 1 2 -2.0", "not a number")
+    fpth.write_text(text)
+
+    kwargs = {
+        "mempath": "gwf/wel",
+        "ftype": "wel6",
+        "model_shape": (1, 1, 1000),
+    }
+    block = TestGwfWel.load_block(fpth, "period", 999, **kwargs)
+    assert block.name == "period"
+    assert block.index == 999
+    period = block.params["period"]
+    assert np.array_equal(period["cellid"], [[0, 0, 998]])
+    assert np.allclose(period["q"], [-999.0])
+
+    dims = TestGwfWel.load_block(fpth, "dimensions", **kwargs)
+    assert dims.params["maxbound"] == 1
+
+    with pytest.raises(KeyError):
+        TestGwfWel.load_block(fpth, "period", 1001, **kwargs)
+
+
+def test_load_lazy(tmp_path):
+    fpth = tmp_path / "gwf.wel"
+    nper = 3650
+    write_wel(fpth, nper)
+    kwargs = {
+        "mempath": "gwf/wel",
+        "ftype": "wel6",
+        "model_shape": (1, 1, nper),
+    }
+
+    package = TestGwfWel.load_lazy(fpth, maxsize=2, **kwargs)
+    assert package.maxbound == 1
+    periods = package.periods
+    assert len(periods) == nper
+    assert list(periods)[:3] == [1, 2, 3]
+    assert periods.loaded == []
+
+    # blocks are loaded on first access, least recently
+    # used blocks are evicted once the cache is full
+    assert np.allclose(periods[10].params["period"]["q"], [-10.0])
+    assert periods[10] is periods[10]
+    periods[20]
+    periods[10]
+    periods[30]
+    assert periods.loaded == [10, 30]
+    assert periods.cache_info() == (3, 3)
+    with pytest.raises(KeyError):
+        periods[nper + 1]
+
+    # modified blocks aren't evicted
+    assert not periods.dirty
+    periods[10]["period"]["q"].value = np.array([5.0])
+    assert periods.dirty and package.dirty
+    periods[40]
+    periods[50]
+    assert periods.loaded == [10, 50]
+
+    # unloaded blocks are copied as they are
+    out = tmp_path / "out.wel"
+    with open(out, "w") as f:
+        package.write(f)
+    package.mark_written(out)
+    assert not package.dirty
+
+    reloaded = TestGwfWel.load_lazy(out, maxsize=None, **kwargs)
+    assert len(reloaded.periods) == nper
+    assert np.allclose(reloaded.periods[10].params["period"]["q"], [5.0])
+    assert np.allclose(reloaded.periods[11].params["period"]["q"], [-11.0])
+    assert np.array_equal(
+        reloaded.periods[nper].params["period"]["cellid"], [[0, 0, nper - 1]]
+    )
+    assert np.allclose(package.periods[10].params["period"]["q"], [5.0])
+
+
+def test_load_lazy_crlf(tmp_path):
+    fpth = tmp_path / "gwf.wel"
+    write_wel(fpth, 3)
+    fpth.write_bytes(fpth.read_bytes().replace(b"\n", b"\r\n"))
+    kwargs = {
+        "mempath": "gwf/wel",
+        "ftype": "wel6",
+        "model_shape": (1, 1, 3),
+    }
+
+    package = TestGwfWel.load_lazy(fpth, **kwargs)
+    assert package.maxbound == 1
+    assert np.allclose(package.periods[2].params["period"]["q"], [-2.0])
+    block = TestGwfWel.load_block(fpth, "period", 3, **kwargs)
+    assert np.allclose(block.params["period"]["q"], [-3.0])
+
+    # copied blocks are written with the output's newlines,
+    # e.g. on Windows, rather than doubling carriage returns
+    out = tmp_path / "out.wel"
+    with open(out, "w", newline="\r\n") as f:
+        package.write(f)
+    text = out.read_bytes()
+    assert b"\r\r" not in text
+    assert text.count(b"\r\n") == text.count(b"\n")
+    assert b"BEGIN PERIOD 3\r\n  1 1 3 -3.0\r\nEND PERIOD 3" in text
+
+
+def test_periods_eager(tmp_path):
+    fpth = tmp_path / "gwf.wel"
+    write_wel(fpth, 1)
+    with open(fpth) as f:
+        package = TestGwfWel.load(f, mempath="gwf/wel", ftype="wel6")
+    assert list(package.periods) == [1]
@@ -1,14 +1,17 @@
 import numpy as np
+import pytest
 
 from flopy4.simulation import MFSimulation
+from flopy4.utils import digest, read_checksum
 
+name = "gwf_1"
+nlay = 3
+nrow = 10
+ncol = 10
+strt = np.linspace(0.0, 30.0, num=300)
 
-def test_load_sim(tmp_path):
-    name = "gwf_1"
 
-    nlay = 3
-    nrow = 10
-    ncol = 10
+def write_inputs(tmp_path):
     dis_fpth = tmp_path / f"{name}.dis"
     with open(dis_fpth, "w") as f:
         f.write("BEGIN OPTIONS\n")
@@ -29,7 +32,6 @@ def test_load_sim(tmp_path):
         f.write("END GRIDDATA\nn\\n")
 
     ic_fpth = tmp_path / f"{name}.ic"
-    strt = np.linspace(0.0, 30.0, num=300)
     array = " ".join(str(x) for x in strt)
     with open(ic_fpth, "w") as f:
         f.write("BEGIN OPTIONS\n")
@@ -129,6 +131,11 @@ def test_load_sim(tmp_path):
         f.write("BEGIN SOLUTIONGROUP 1\n")
         f.write(f"  ims6  {tmp_path}/{name}.ims  {name}\n")
         f.write("END SOLUTIONGROUP 1\n\n")
+    return sim_fpth
+
+
+def test_load_sim(tmp_path):
+    sim_fpth = write_inputs(tmp_path)
 
     s = None
     with open(sim_fpth, "r") as f:
@@ -343,3 +350,243 @@ def test_load_sim(tmp_path):
     write_dir = tmp_path / "write"
     os.makedirs(write_dir)
     s.write(write_dir)
+
+
+# name file paths are lowercased on load, so avoid
+# the uppercase test id (and tmp_path) "None"
+@pytest.mark.parametrize(
+    "parallel",
+    [None, "thread", "process"],
+    ids=["serial", "thread", "process"],
+)
+def test_load_sim_parallel(tmp_path, parallel):
+    sim_fpth = write_inputs(tmp_path)
+
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f, parallel=parallel, max_workers=2)
+
+    assert list(s.models) == [name]
+    assert list(s.solvers) == ["ims_0"]
+    assert s.solvers["ims_0"].params["outer_maximum"] == 500
+    assert np.allclose(
+        strt, s.models[name].resolve(f"sim/{name}/ic/griddata/strt")
+    )
+    assert set(s.timings) == {"tdis", name, "ims_0"}
+    assert all(t >= 0 for t in s.timings.values())
+
+
+@pytest.mark.parametrize("parallel", ["thread", "process"])
+def test_write_sim_parallel(tmp_path, parallel):
+    sim_fpth = write_inputs(tmp_path)
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f)
+
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+    s.write(serial_dir, binary_threshold=100)
+    s.write(
+        parallel_dir, binary_threshold=100, parallel=parallel, max_workers=4
+    )
+
+    files = sorted(p.name for p in serial_dir.iterdir())
+    assert files == sorted(p.name for p in parallel_dir.iterdir())
+    assert not any(name.endswith(".tmp") for name in files)
+    assert any(name.endswith(".bin") for name in files)
+    for name in files:
+        expected = (serial_dir / name).read_bytes()
+        assert (parallel_dir / name).read_bytes() == expected
+
+
+def test_write_sim_atomic(tmp_path, monkeypatch):
+    sim_fpth = write_inputs(tmp_path)
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f)
+
+    write_dir = tmp_path / "write"
+    write_dir.mkdir()
+    s.write(write_dir, binary_threshold=100)
+    files = {p.name: p.read_bytes() for p in write_dir.iterdir()}
+
+    # if any file fails to write, none are replaced, including
+    # external binary files written by other packages
+    s.models[name]["ic"]["griddata"]["strt"][0:2] += 1.0
+
+    def fail(self, f, **kwargs):
+        raise ValueError("Failed to write")
+
+    monkeypatch.setattr(type(s.tdis), "write", fail)
+    s.tdis.dirty = True
+    with pytest.raises(ValueError):
+        s.write(write_dir, binary_threshold=100, parallel="thread")
+    assert files == {p.name: p.read_bytes() for p in write_dir.iterdir()}
+
+    monkeypatch.undo()
+    s.write(write_dir, binary_threshold=100, parallel="thread")
+    assert files["ic.strt.bin"] != (write_dir / "ic.strt.bin").read_bytes()
+
+
+def test_write_sim_incremental(tmp_path):
+    sim_fpth = write_inputs(tmp_path)
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f)
+
+    write_dir = tmp_path / "write"
+    write_dir.mkdir()
+    s.write(write_dir, binary_threshold=100)
+    files = {p.name: p.stat().st_ino for p in write_dir.iterdir()}
+    assert not s.models[name]["ic"].dirty
+
+    # modify the initial heads in place, only the package
+    # and external files holding them should be rewritten
+    s.models[name]["ic"]["griddata"]["strt"][0] = -1.0
+    assert s.models[name]["ic"].dirty
+    assert not s.models[name]["dis"].dirty
+    s.write(write_dir, binary_threshold=100)
+    rewritten = {
+        p.name for p in write_dir.iterdir() if p.stat().st_ino != files[p.name]
+    }
+    assert rewritten == {"ic", "ic.strt.bin"}
+
+    # nothing changed, nothing is rewritten, unless forced
+    files = {p.name: p.stat().st_ino for p in write_dir.iterdir()}
+    s.write(write_dir, binary_threshold=100)
+    assert files == {p.name: p.stat().st_ino for p in write_dir.iterdir()}
+
+    # edits can't bypass dirty tracking via views of the data,
+    # and augmented assignments to a selection are written back
+    strt = s.models[name]["ic"]["griddata"]["strt"]
+    with pytest.raises(ValueError):
+        strt.raw[0] = 0.0
+    with pytest.raises(ValueError):
+        strt[0:2][:] = 0.0
+    assert not s.models[name]["ic"].dirty
+    strt[0:2] += 1.0
+    assert s.models[name]["ic"].dirty
+    s.write(write_dir, binary_threshold=100)
+    assert "ic.strt.bin" in {
+        p.name for p in write_dir.iterdir() if p.stat().st_ino != files[p.name]
+    }
+
+    files = {p.name: p.stat().st_ino for p in write_dir.iterdir()}
+    s.write(write_dir, binary_threshold=100, force=True)
+    assert not any(
+        p.stat().st_ino == files[p.name] for p in write_dir.iterdir()
+    )
+
+
+def test_write_sim_checksum(tmp_path):
+    sim_fpth = write_inputs(tmp_path)
+    write_dir = tmp_path / "write"
+    write_dir.mkdir()
+    with open(sim_fpth, "r") as f:
+        MFSimulation.load(f).write(
+            write_dir, binary_threshold=100, checksum=True
+        )
+    files = {p.name: p.stat().st_ino for p in write_dir.iterdir()}
+    assert "ic.sha256" in files
+    assert "ic.strt.bin.sha256" in files
+
+    # a freshly loaded simulation skips files with matching
+    # checksums. the package file only refers to the external
+    # file holding the heads, so it's unchanged too.
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f)
+    s.models[name]["ic"]["griddata"]["strt"][0] = -1.0
+    s.write(write_dir, binary_threshold=100, checksum=True)
+    rewritten = {
+        p.name for p in write_dir.iterdir() if p.stat().st_ino != files[p.name]
+    }
+    assert rewritten == {"ic.strt.bin", "ic.strt.bin.sha256"}
+
+
+def test_write_sim_options(tmp_path):
+    sim_fpth = write_inputs(tmp_path)
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f)
+
+    # changing write options rewrites clean packages
+    write_dir = tmp_path / "write"
+    write_dir.mkdir()
+    s.write(write_dir, binary_threshold=100)
+    assert "OPEN/CLOSE" in (write_dir / "ic").read_text()
+    s.write(write_dir)
+    assert "OPEN/CLOSE" not in (write_dir / "ic").read_text()
+
+
+def test_write_sim_stale_checksum(tmp_path):
+    sim_fpth = write_inputs(tmp_path)
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f)
+
+    # checksum files are kept up to date, not removed, by
+    # writes without checksums, in the same commit phase
+    write_dir = tmp_path / "write"
+    write_dir.mkdir()
+    s.write(write_dir, binary_threshold=100, checksum=True)
+    s.models[name]["ic"]["griddata"]["strt"][0] = -1.0
+    s.write(write_dir, binary_threshold=100)
+    for fname in ["ic", "ic.strt.bin"]:
+        fpath = write_dir / fname
+        content = fpath.read_bytes()
+        if fname == "ic":
+            content = fpath.read_text().encode()
+        assert read_checksum(fpath) == digest(content)
+
+
+def test_write_sim_process_binaries(tmp_path):
+    sim_fpth = write_inputs(tmp_path)
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f)
+
+    # binary files written in worker processes are recorded
+    # in the parent, so they aren't rewritten needlessly
+    write_dir = tmp_path / "write"
+    write_dir.mkdir()
+    s.write(write_dir, binary_threshold=100, parallel="process")
+    files = {p.name: p.stat().st_ino for p in write_dir.iterdir()}
+    s.models[name]["ic"].dirty = True
+    s.write(write_dir, binary_threshold=100)
+    rewritten = {
+        p.name for p in write_dir.iterdir() if p.stat().st_ino != files[p.name]
+    }
+    assert rewritten == {"ic"}
+
+
+def test_resolve_index(tmp_path):
+    sim_fpth = write_inputs(tmp_path)
+    with open(sim_fpth, "r") as f:
+        s = MFSimulation.load(f)
+    gwf = s.models[name]
+
+    # lookups return the live parameter, evaluating nothing
+    strt = gwf["ic"]["griddata"]["strt"]
+    strt._invalidate()
+    misses = strt.cache_info().misses
+    nlay_param = gwf.lookup(f"sim/{name}/dis/dimensions/nlay")
+    assert nlay_param is gwf["dis"]["dimensions"]["nlay"]
+    assert gwf.resolve(f"sim/{name}/dis/dimensions/nlay") == nlay
+    assert gwf.lookup(f"sim/{name}/ic/griddata/strt") is strt
+    assert strt.cache_info().misses == misses
+    assert gwf.lookup(f"sim/{name}/ic/griddata/nope") is None
+
+    # the index follows replaced components
+    dims = type(gwf["dis"]["dimensions"])(
+        name="dimensions", params={"nlay": 5, "nrow": nrow, "ncol": ncol}
+    )
+    gwf["dis"]["dimensions"] = dims
+    assert gwf.lookup(f"sim/{name}/dis/dimensions/nlay") is dims["nlay"]
+    assert gwf.resolve(f"sim/{name}/dis/dimensions/nlay") == 5
+
+    # and replaced models
+    with open(sim_fpth, "r") as f:
+        other = MFSimulation.load(f)
+    s.models[name] = other.models[name]
+    other.models[name] = gwf
+    path = f"sim/{name}/dis/dimensions/nlay"
+    assert s.models[name].resolve(path) == nlay
+    assert gwf.resolve(path) == 5
+
+    # each simulation has its own index
+    assert s.models[name].lookup(path) is not gwf.lookup(path)
@@ -0,0 +1,165 @@
+import re
+from io import BytesIO, StringIO
+from time import perf_counter
+
+import numpy as np
+import pytest
+
+from flopy4.array import MFArray
+from flopy4.compound import MFList
+from flopy4.io.tokens import (
+    TokenReader,
+    clean,
+    next_line,
+    read_chunks,
+    split,
+    strip,
+)
+from flopy4.scalar import MFDouble, MFInteger
+
+
+def test_strip():
+    assert strip("  a b  # c ! d") == "a b"
+    assert strip("a // b # c") == "a"
+    assert strip("a,b, c!d") == "a b  c"
+    assert strip("# comment") == ""
+    assert split("  AUXILIARY Conc,Temp # x") == ["auxiliary", "conc", "temp"]
+    assert split("FILEIN Some/Path", lower=False) == ["FILEIN", "Some/Path"]
+
+
+def test_next_line():
+    f = StringIO("\n  # comment\n\n  INTERNAL FACTOR 1.0 ! x\n1.0\n")
+    assert next_line(f) == "internal factor 1.0"
+    assert next_line(f) == "1.0"
+    assert next_line(f) == ""
+
+
+def test_clean():
+    text = "a,b # c\r\n// d\n e ! f\n"
+    assert clean(text) == "a b    \r\n    \n e    \n"
+    assert clean(text.encode()) == clean(text).encode()
+
+
+def test_read_chunks():
+    text = "".join(f"line {i}, # comment {i}\n" for i in range(100))
+    chunks = list(read_chunks(BytesIO(text.encode()), size=64))
+    assert len(chunks) > 1
+    for offset, chunk in chunks:
+        assert chunk.endswith(b"\n")
+        assert chunk == clean(text[offset : offset + len(chunk)].encode())
+    assert b"".join(c for _, c in chunks) == clean(text.encode())
+
+
+def test_token_reader():
+    text = "".join(f"Line {i} ! x\n" for i in range(100))
+    f = TokenReader(StringIO(text), size=64)
+    assert f.readline() == "Line 0    \n"
+    pos = f.tell()
+    lines = [f.readline() for _ in range(50)]
+    assert lines[-1] == "Line 50    \n"
+
+    # seek back across chunks
+    f.seek(pos)
+    assert f.readline() == "Line 1    \n"
+    f.seek(0)
+    assert [f.readline() for _ in range(51)][1:] == lines
+
+    # read runs of lines up to a matching one
+    pattern = re.compile(r"^Line 80\b", re.MULTILINE)
+    text = ""
+    while True:
+        chunk = f.read_until(pattern)
+        if not chunk:
+            break
+        text += chunk
+    assert text.splitlines()[-1].strip() == "Line 79"
+    assert f.readline().strip() == "Line 80"
+
+
+def test_token_reader_wrap(tmp_path):
+    fpth = tmp_path / "list.txt"
+    fpth.write_text("1 2\n3 4 # x\nEND\nafter\n")
+    with open(fpth) as f:
+        with TokenReader.wrap(f) as reader:
+            assert reader.readline() == "1 2\n"
+            assert reader.readline() == "3 4    \n"
+            with TokenReader.wrap(reader) as inner:
+                assert inner is reader
+        # the file is left after what the reader read
+        assert f.readline() == "END\n"
+
+
+def test_read_columns_chunked():
+    params = {"cellid": MFArray(shape="(ncelldim)"), "q": MFDouble()}
+    rows = [f"  1 {i + 1} 1 {i}.5 ! well {i}\n" for i in range(200)]
+    text = "".join(rows[:100]) + "\n" + "".join(rows[100:]) + "END PERIOD\n"
+    f = TokenReader(StringIO(text), size=256)
+    cellid, q = MFList.read_columns(f, params, ncelldim=3)
+    assert cellid.shape == (200, 3)
+    assert np.array_equal(cellid[:, 1], np.arange(200))
+    assert np.allclose(q, np.arange(200) + 0.5)
+    assert f.readline() == "END PERIOD\n"
+
+    params = {"cellid": MFArray(shape="(ncelldim)"), "n": MFInteger()}
+    with pytest.raises(ValueError):
+        MFList.read_columns(StringIO("1 1 1 1\n1 1 1\n"), params)
+
+
+def test_read_array_chunked():
+    text = "".join(f"{i}.0 {i}.5 # x\n" for i in range(100)) + "1.0\nEND\n"
+    f = TokenReader(StringIO(text), size=64)
+    array = MFArray.read_array(f, shape=200)
+    assert np.allclose(array, np.arange(200) / 2)
+    # the array ends mid-chunk, the rest is left
+    assert f.readline() == "1.0\n"
+
+    f = TokenReader(StringIO(text), size=64)
+    array = MFArray.read_array(f)
+    assert array.size == 201
+    assert f.readline() == "END\n"
+
+
+def write_wel(fpth, nrows):
+    with open(fpth, "w") as f:
+        f.write("BEGIN OPTIONS\n  PRINT_INPUT\nEND OPTIONS\n\n")
+        f.write(f"BEGIN DIMENSIONS\n  MAXBOUND {nrows}\nEND DIMENSIONS\n\n")
+        f.write("BEGIN PERIOD 1\n")
+        for i in range(nrows):
+            f.write(f"  1 {i // 1000 + 1} {i % 1000 + 1} {-i:.3f}  # well\n")
+        f.write("END PERIOD 1\n")
+
+
+@pytest.mark.slow
+def test_benchmark_tokenizer(tmp_path):
+    nrows = 1_000_000
+    fpth = tmp_path / "gwf.wel"
+    write_wel(fpth, nrows)
+    size = fpth.stat().st_size / 1e6
+
+    def report(name, elapsed):
+        rate = size / elapsed
+        print(f"{name}: {size:.1f} MB in {elapsed:.3f}s, {rate:.1f} MB/s")
+
+    # cleaning chunks, as the block index does
+    start = perf_counter()
+    with open(fpth, "rb") as f:
+        nbytes = sum(len(chunk) for _, chunk in read_chunks(f))
+    report("read_chunks", perf_counter() - start)
+    assert nbytes == fpth.stat().st_size
+
+    # per-line splitting, as before the tokenizer
+    start = perf_counter()
+    with open(fpth) as f:
+        ntokens = sum(len(split(line)) for line in f)
+    report("split", perf_counter() - start)
+    assert ntokens == 4 * nrows + 17
+
+    # list rows via the reader, as the list loader does
+    params = {"cellid": MFArray(shape="(ncelldim)"), "q": MFDouble()}
+    start = perf_counter()
+    with open(fpth) as f:
+        while not f.readline().startswith("BEGIN PERIOD"):
+            pass
+        cellid, q = MFList.read_columns(f, params, nrows, ncelldim=3)
+    report("read_columns", perf_counter() - start)
+    assert len(q) == nrows